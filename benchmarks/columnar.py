@@ -0,0 +1,75 @@
+# Compares the vectorized NumPy rankings (ItemColumns, MonsterColumns) against plain scans over the cached dicts
+# Uses the real catalog when ARTIFACTS_TOKEN and ARTIFACTS_CHARACTER are set, a synthetic one of the same size otherwise
+# Run it with: python benchmarks/columnar.py
+import os
+import random
+import timeit
+from types import SimpleNamespace
+
+import artifactsmmo_wrapper as wrapper
+
+WEIGHTS = {"attack_earth": 1.0, "dmg_earth": 0.5, "critical_strike": 0.2}
+RESISTANCES = {"fire": 10, "earth": 25, "water": 0, "air": 5}
+
+def synthetic_catalog(item_count=400, monster_count=60):
+    rng = random.Random(42)
+    types = ["weapon", "helmet", "body_armor", "leg_armor", "boots", "ring", "amulet", "shield", "resource", "consumable"]
+    stats = ["attack_fire", "attack_earth", "attack_water", "attack_air", "dmg_fire", "dmg_earth", "dmg_water", "dmg_air",
+             "res_fire", "res_earth", "res_water", "res_air", "hp", "haste", "critical_strike", "wisdom"]
+    items = [{"code": f"item_{i}", "name": f"Item {i}", "level": rng.randint(1, 40), "type": rng.choice(types), "craft": None,
+              "effects": [{"code": stat, "value": rng.randint(1, 30)} for stat in rng.sample(stats, rng.randint(0, 4))]}
+             for i in range(item_count)]
+    monsters = [dict({"code": f"monster_{i}", "name": f"Monster {i}", "level": rng.randint(1, 40), "hp": rng.randint(60, 1200),
+                      "critical_strike": rng.randint(0, 10), "drops": []},
+                     **{f"attack_{element}": rng.choice([0, 0, rng.randint(4, 60)]) for element in wrapper.ELEMENTS},
+                     **{f"res_{element}": rng.randint(-10, 40) for element in wrapper.ELEMENTS})
+                for i in range(monster_count)]
+    return items, monsters
+
+def best_items_scan(items, weights, k, item_type, max_level):
+    scored = []
+    for item in items:
+        if item["type"] != item_type or item["level"] > max_level:
+            continue
+        score = sum(weights.get(effect["code"], 0) * effect["value"] for effect in item.get("effects") or [])
+        scored.append((item, score))
+    return sorted(scored, key=lambda entry: -entry[1])[:k]
+
+def least_dangerous_scan(monsters, resistances, k):
+    scored = [(monster, sum(monster[f"attack_{element}"] * (1 - resistances[element] / 100) for element in wrapper.ELEMENTS))
+              for monster in monsters]
+    return sorted(scored, key=lambda entry: entry[1])[:k]
+
+def main():
+    token, character = os.environ.get("ARTIFACTS_TOKEN"), os.environ.get("ARTIFACTS_CHARACTER")
+    if token and character:
+        api = wrapper.ArtifactsAPI(token, character)
+        items, monsters = api.items, api.monsters
+        items._cache_items()
+        monsters._cache_monsters()
+    else:
+        store = wrapper.StaticDataStore.get_shared()
+        catalog, bestiary = synthetic_catalog()
+        store.set("items", catalog)
+        store.set("monsters", bestiary)
+        api = SimpleNamespace(char=SimpleNamespace(name="benchmark"))
+        items, monsters = wrapper.Items(api), wrapper.Monsters(api)
+    items.columns, monsters.columns  # Build the views outside of the timings
+
+    print(f"Catalog size: {len(items.all_items)} items, {len(monsters.all_monsters)} monsters")
+    cases = [
+        ("best earth weapon under level 25",
+         lambda: items.get_best_items(WEIGHTS, 5, item_type="weapon", max_level=25),
+         lambda: best_items_scan(items.all_items, WEIGHTS, 5, "weapon", 25)),
+        ("least dangerous monsters",
+         lambda: monsters.get_least_dangerous(RESISTANCES, 5),
+         lambda: least_dangerous_scan(monsters.all_monsters, RESISTANCES, 5)),
+    ]
+    for name, vectorized, scan in cases:
+        assert [round(score, 6) for _, score in vectorized()] == [round(score, 6) for _, score in scan()]
+        vectorized_time = min(timeit.repeat(vectorized, number=1000, repeat=5))
+        scan_time = min(timeit.repeat(scan, number=1000, repeat=5))
+        print(f"{name}: scan {scan_time * 1000:.3f} us, vectorized {vectorized_time * 1000:.3f} us, speedup x{scan_time / vectorized_time:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Compares Items._filter_items, which narrows candidates with ItemIndex, against the previous full linear scan
+# Uses the real item catalog when ARTIFACTS_TOKEN and ARTIFACTS_CHARACTER are set, a synthetic one of the same size otherwise
+# Run it with: python benchmarks/items_index.py
+import os
+import random
+import timeit
+from types import SimpleNamespace
+
+import artifactsmmo_wrapper as wrapper
+
+QUERIES = [
+    {"item_type": "weapon"},
+    {"craft_skill": "gearcrafting", "max_level": 20},
+    {"craft_material": "copper", "min_level": 5},
+    {"item_type": "ring", "min_level": 10, "max_level": 30},
+]
+
+def synthetic_catalog(size=400):
+    rng = random.Random(42)
+    types = ["weapon", "helmet", "body_armor", "leg_armor", "boots", "ring", "amulet", "shield", "resource", "consumable"]
+    skills = ["weaponcrafting", "gearcrafting", "jewelrycrafting", "cooking", "alchemy", "mining", "woodcutting"]
+    materials = ["copper", "iron", "ash_plank", "feather", "cowhide", "sap", "coal", "gold"]
+    catalog = []
+    for i in range(size):
+        craft = None
+        if rng.random() < 0.6:
+            craft = {
+                "skill": rng.choice(skills),
+                "level": rng.randint(1, 40),
+                "items": [{"code": code, "quantity": rng.randint(1, 6)} for code in rng.sample(materials, 2)],
+                "quantity": 1,
+            }
+        catalog.append({"code": f"item_{i}", "name": f"Item {i}", "level": rng.randint(1, 40),
+                        "type": rng.choice(types), "craft": craft, "effects": []})
+    return catalog
+
+def linear_scan(items, params):
+    # The filtering logic Items._filter_items used before the index was introduced
+    for key, value in params.items():
+        if key == 'craft_material':
+            items = [item for item in items if item.get('craft') and any(material['code'] == value for material in item['craft'].get('items', []))]
+        elif key == 'craft_skill':
+            items = [item for item in items if item.get('craft') and item['craft']['skill'] == value]
+        elif key == 'max_level':
+            items = [item for item in items if item['level'] <= value]
+        elif key == 'min_level':
+            items = [item for item in items if item['level'] >= value]
+        elif key == 'item_type':
+            items = [item for item in items if item['type'] == value]
+    return items
+
+def main():
+    token, character = os.environ.get("ARTIFACTS_TOKEN"), os.environ.get("ARTIFACTS_CHARACTER")
+    if token and character:
+        items = wrapper.ArtifactsAPI(token, character).items
+        items._cache_items()
+    else:
+        wrapper.StaticDataStore.get_shared().set("items", synthetic_catalog())
+        items = wrapper.Items(SimpleNamespace(char=SimpleNamespace(name="benchmark")))
+    catalog = items.all_items
+    items.index  # Build the index outside of the timings
+
+    print(f"Catalog size: {len(catalog)} items")
+    for params in QUERIES:
+        assert items._filter_items(params) == linear_scan(catalog, params)
+        indexed = min(timeit.repeat(lambda: items._filter_items(params), number=1000, repeat=5))
+        scanned = min(timeit.repeat(lambda: linear_scan(catalog, params), number=1000, repeat=5))
+        print(f"{params}: scan {scanned * 1000:.3f} us, index {indexed * 1000:.3f} us, speedup x{scanned / indexed:.1f}")
+
+if __name__ == "__main__":
+    main()
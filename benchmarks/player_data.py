@@ -0,0 +1,61 @@
+# Compares building PlayerData field by field with keyword arguments (the former get_character) against
+# the generated payload loader, both as a new object (from_payload) and as an in-place refresh (update)
+# Uses the real character payload when ARTIFACTS_TOKEN and ARTIFACTS_CHARACTER are set, a synthetic one otherwise
+# Run it with: python benchmarks/player_data.py
+import dataclasses
+import os
+import sys
+import timeit
+
+import artifactsmmo_wrapper as wrapper
+
+def synthetic_payload():
+    data = {attribute.name: 0 for attribute in dataclasses.fields(wrapper.PlayerData)}
+    data.update(name="benchmark", account="benchmark", skin="men1", x=0, y=0, cooldown_expiration="2025-01-01T00:00:00Z",
+                task="chicken", task_type="monsters", inventory_max_items=100)
+    for slot in ("weapon", "shield", "helmet", "body_armor", "leg_armor", "boots", "ring1", "ring2", "amulet",
+                 "artifact1", "artifact2", "artifact3", "utility1", "utility2"):
+        data[f"{slot}_slot"] = ""
+    del data["pos"]
+    data["inventory"] = [{"slot": slot, "code": f"item_{slot}" if slot < 12 else "", "quantity": slot % 7 if slot < 12 else 0}
+                         for slot in range(1, 21)]
+    return data
+
+def compile_keyword_construction():
+    # The former get_character: one keyword argument per field, read from the payload
+    arguments = ",\n        ".join(
+        "pos=wrapper.Position(data['x'], data['y'])" if attribute.name == "pos" else
+        "inventory=[wrapper.InventoryItem(slot=item['slot'], code=item['code'], quantity=item['quantity']) "
+        "for item in data.get('inventory', []) if item['code']]" if attribute.name == "inventory" else
+        f"{attribute.name}=data[{attribute.name!r}]"
+        for attribute in dataclasses.fields(wrapper.PlayerData))
+    namespace = {"wrapper": wrapper}
+    exec(f"def keyword_construction(data):\n    return wrapper.PlayerData(\n        {arguments})", namespace)
+    return namespace["keyword_construction"]
+
+def main():
+    token, character = os.environ.get("ARTIFACTS_TOKEN"), os.environ.get("ARTIFACTS_CHARACTER")
+    if token and character:
+        api = wrapper.ArtifactsAPI(token, character)
+        data = api._make_request("GET", f"characters/{character}", source="get_character")["data"]
+    else:
+        data = synthetic_payload()
+    keyword_construction = compile_keyword_construction()
+
+    player = wrapper.PlayerData.from_payload(data)
+    assert player == keyword_construction(data)
+    print(f"PlayerData: {len(dataclasses.fields(player))} fields, {sys.getsizeof(player)} bytes per instance, no __dict__")
+
+    cases = [
+        ("keyword construction", lambda: keyword_construction(data)),
+        ("from_payload", lambda: wrapper.PlayerData.from_payload(data)),
+        ("update in place", lambda: player.update(data)),
+    ]
+    baseline = None
+    for name, build in cases:
+        elapsed = min(timeit.repeat(build, number=10000, repeat=5)) / 10000
+        baseline = baseline or elapsed
+        print(f"{name}: {elapsed * 1e6:.2f} us, x{baseline / elapsed:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# This example gathers at the nearest ash tree with every character at once, using a single asyncio event loop instead of one thread per character
+# This example relies on the package to be installed with the async extra. Please install it using pip install --upgrade artifactsmmo-wrapper[async]
+TOKEN = "YOUR_TOKEN_HERE" # TODO: Make sure to paste your token here
+doods = ["YOUR_CHARACTERS_HERE"] # TODO: Make sure to fill in your characters into this array. If you have 1, or if you have 5, make sure to put them here
+
+import asyncio
+import artifactsmmo_wrapper as wrapper
+
+async def gather_loop(api):
+    await api.actions.move(*api.content_maps.ash_tree)
+    while api.char.get_inventory_space() >= 5:
+        # Cooldowns are awaited, so the other characters keep running in the meantime
+        await api.actions.gather()
+
+    await api.actions.move(*api.content_maps.bank)
+    for item in api.char.inventory:
+        await api.actions.bank_deposit_item(item.code, item.quantity)
+
+async def main():
+    chars = await asyncio.gather(*[wrapper.AsyncArtifactsAPI.create(TOKEN, dood) for dood in doods])
+    await asyncio.gather(*[gather_loop(api) for api in chars])
+    await chars[0].session_pool.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -20,4 +20,8 @@ setup(
     install_requires=[
         "requests"
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "numpy": ["numpy"],
+    },
 )
@@ -1,14 +1,36 @@
 import requests
+from requests.adapters import HTTPAdapter
+import sys
 import time
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+import json
+import sqlite3
+import zlib
+from contextlib import closing
+from dataclasses import dataclass, field, fields
+from typing import Callable, List, Dict, Optional, Tuple
 import logging
 from datetime import datetime, timezone
 
-from threading import Lock
-from functools import wraps
+from threading import Lock, Condition, Event, Thread
+from functools import wraps, lru_cache
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import heapq
 import math
+import itertools
+import random
+from email.utils import parsedate_to_datetime
 import re
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 debug=False
 
@@ -174,15 +196,115 @@ class APIException(Exception):
             super().__init__(message)
             logger.warning(f"MaxCharactersReached: {message}")
 
+    class RetriesExhausted(Exception):
+        def __init__(self, message="Request failed after exhausting all retries"):
+            super().__init__(message)
+            logger.error(f"RetriesExhausted: {message}", extra={"char": "Unknown"})
+
+    class RecipeCycle(Exception):
+        def __init__(self, message="Item recipes form a cycle"):
+            super().__init__(message)
+            logger.error(f"RecipeCycle: {message}", extra={"char": "Unknown"})
+
+
+class CooldownScheduler:
+    """
+    A process-wide timer heap that wakes each thread waiting on a cooldown at its expiration time.
+
+    A single sleeper thread serves every waiting character, replacing per-thread polling loops.
+    """
+    _shared: Optional["CooldownScheduler"] = None
+    _shared_lock = Lock()
+
+    def __init__(self):
+        self.condition = Condition()
+        self.heap = []
+        self.counter = itertools.count()
+        self.thread = None
+        self.latencies: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def get_shared(cls) -> "CooldownScheduler":
+        """Get the process-wide scheduler, creating it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _run(self) -> None:
+        with self.condition:
+            while True:
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                deadline, _, event = self.heap[0]
+                now = time.time()
+                if deadline <= now:
+                    heapq.heappop(self.heap)
+                    event.set()
+                else:
+                    self.condition.wait(deadline - now)
+
+    def wait_until(self, expiration: datetime, name: str = "Unknown") -> None:
+        """
+        Block the calling thread until the given expiration time.
+
+        Args:
+            expiration (datetime): Timezone aware time at which to wake up.
+            name (str): Character name used for the wake-up latency statistics.
+        """
+        deadline = expiration.timestamp()
+        if deadline <= time.time():
+            return
+
+        event = Event()
+        with self.condition:
+            heapq.heappush(self.heap, (deadline, next(self.counter), event))
+            if self.thread is None:
+                self.thread = Thread(target=self._run, name="CooldownScheduler", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        event.wait()
+        self.record_latency(name, time.time() - deadline)
+
+    def record_latency(self, name: str, latency: float) -> None:
+        """Record how late a character was woken up after its cooldown expired."""
+        with self.condition:
+            stats = self.latencies.setdefault(name, {"wakeups": 0, "last": 0.0, "max": 0.0, "total": 0.0})
+            stats["wakeups"] += 1
+            stats["last"] = latency
+            stats["max"] = max(stats["max"], latency)
+            stats["total"] += latency
+
+    def wake_latency(self, name: Optional[str] = None) -> Dict:
+        """
+        Get wake-up latency statistics, in seconds.
+
+        Args:
+            name (Optional[str]): Character to report on; reports every character if None.
+
+        Returns:
+            dict: Wake-ups, last, max and mean latency per character (or for the given character).
+        """
+        with self.condition:
+            report = {
+                char: dict(stats, mean=stats["total"] / stats["wakeups"])
+                for char, stats in self.latencies.items()
+            }
+        if name is not None:
+            return report.get(name, {})
+        return report
+
 
 class CooldownManager:
     """
     A class to manage cooldowns for different operations using an expiration timestamp.
     """
-    def __init__(self):
+    def __init__(self, scheduler: Optional[CooldownScheduler] = None):
         self.lock = Lock()
         self.cooldown_expiration_time = None
         self.logger = None
+        self.scheduler = scheduler or CooldownScheduler.get_shared()
 
     def is_on_cooldown(self) -> bool:
         """Check if currently on cooldown based on expiration time."""
@@ -202,14 +324,22 @@ class CooldownManager:
         """Wait until the cooldown expires."""
         if self.is_on_cooldown():
             remaining = (self.cooldown_expiration_time - datetime.now(timezone.utc)).total_seconds()
+            name = char.name if char else "Unknown"
             if logger:
-                if char:
-                    logger.debug(f"Waiting for cooldown... ({remaining:.1f} seconds)", extra={"char": char.name})
-                else:
-                    logger.debug(f"Waiting for cooldown... ({remaining:.1f} seconds)", extra={"char": "Unknown"})
-            while self.is_on_cooldown():
-                remaining = (self.cooldown_expiration_time - datetime.now(timezone.utc)).total_seconds()
-                time.sleep(min(remaining, 0.1))  # Sleep in small intervals
+                logger.debug(f"Waiting for cooldown... ({remaining:.1f} seconds)", extra={"char": name})
+            self.scheduler.wait_until(self.cooldown_expiration_time, name)
+
+    async def wait_for_cooldown_async(self, logger=None, char=None) -> None:
+        """Wait until the cooldown expires without blocking the event loop."""
+        if self.is_on_cooldown():
+            remaining = (self.cooldown_expiration_time - datetime.now(timezone.utc)).total_seconds()
+            name = char.name if char else "Unknown"
+            if logger:
+                logger.debug(f"Waiting for cooldown... ({remaining:.1f} seconds)", extra={"char": name})
+            # The event loop already keeps its timers in a heap, so a plain sleep wakes on time
+            await asyncio.sleep(max(remaining, 0))
+            latency = (datetime.now(timezone.utc) - self.cooldown_expiration_time).total_seconds()
+            self.scheduler.record_latency(name, latency)
 
 def with_cooldown(func):
     """
@@ -246,6 +376,447 @@ def with_cooldown(func):
     return wrapper
 
 
+class HTTPSessionPool:
+    """
+    A pooled keep-alive HTTP transport that can be shared by several ArtifactsAPI instances.
+
+    Every instance created without an explicit pool uses the process-wide shared pool,
+    so characters running in the same process reuse warm TCP/TLS connections.
+    """
+    _shared: Optional["HTTPSessionPool"] = None
+    _shared_lock = Lock()
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10):
+        """
+        Args:
+            pool_connections (int): Number of host pools to keep (default is 10).
+            pool_maxsize (int): Maximum number of keep-alive connections per host (default is 10).
+        """
+        self.lock = Lock()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.requests_sent = 0
+
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    @classmethod
+    def get_shared(cls, pool_connections: int = 10, pool_maxsize: int = 10) -> "HTTPSessionPool":
+        """
+        Get the process-wide pool, creating it on first use.
+
+        The size arguments are only used when the shared pool does not exist yet.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            return cls._shared
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the pooled session."""
+        with self.lock:
+            self.requests_sent += 1
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get connection reuse statistics for the pool.
+
+        Returns:
+            dict: Requests sent, connections opened and how many requests reused a warm connection.
+        """
+        connections_opened = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+        return {
+            "requests": self.requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": max(self.requests_sent - connections_opened, 0),
+            "pool_maxsize": self.pool_maxsize,
+        }
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.session.close()
+
+
+class TokenBucket:
+    """A thread-safe token bucket that hands out the delay each caller must wait before sending."""
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum burst size.
+        """
+        self.lock = Lock()
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+        self.requests = 0
+        self.delayed = 0
+        self.total_delay = 0.0
+        self.max_delay = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if the bucket is empty.
+
+        Returns:
+            float: Seconds the caller has to wait before using the token.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.requests += 1
+            if delay:
+                self.delayed += 1
+                self.total_delay += delay
+                self.max_delay = max(self.max_delay, delay)
+            return delay
+
+    def stats(self) -> Dict[str, float]:
+        """Get the queueing delay statistics of the bucket, in seconds."""
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "delayed": self.delayed,
+                "total_delay": self.total_delay,
+                "max_delay": self.max_delay,
+                "mean_delay": self.total_delay / self.requests if self.requests else 0.0,
+            }
+
+
+class RateLimiter:
+    """
+    Account-wide rate limiting shared by every wrapper instance using the same token.
+
+    Action endpoints and data endpoints are throttled by separate token buckets,
+    matching the separate limits the server applies to them.
+    """
+    # Bucket name -> (requests, period in seconds)
+    DEFAULT_LIMITS: Dict[str, Tuple[int, float]] = {
+        "action": (7, 2),
+        "data": (16, 1),
+    }
+    _limiters: Dict[str, "RateLimiter"] = {}
+    _limiters_lock = Lock()
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, float]]] = None):
+        """
+        Args:
+            limits (Optional[dict]): Bucket name to (requests, period) overrides of DEFAULT_LIMITS.
+        """
+        limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate=requests / period, capacity=requests)
+            for name, (requests, period) in limits.items()
+        }
+
+    @classmethod
+    def for_token(cls, token: str, limits: Optional[Dict[str, Tuple[int, float]]] = None) -> "RateLimiter":
+        """
+        Get the limiter of an account, creating it on first use.
+
+        The limits are only used when the account has no limiter yet.
+        """
+        with cls._limiters_lock:
+            if token not in cls._limiters:
+                cls._limiters[token] = cls(limits)
+            return cls._limiters[token]
+
+    @staticmethod
+    def bucket_for(endpoint: str) -> str:
+        """Get the name of the bucket an endpoint is throttled by."""
+        return "action" if "/action/" in f"/{endpoint}" else "data"
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        Block until a request to the endpoint may be sent.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        delay = self.buckets[self.bucket_for(endpoint)].reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, endpoint: str) -> float:
+        """The asyncio counterpart of acquire."""
+        delay = self.buckets[self.bucket_for(endpoint)].reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the queueing delay statistics of every bucket."""
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to back off between attempts.
+
+    Only network errors and transient HTTP statuses are retried; game errors are raised at once.
+    Backoff is exponential with full jitter, and a Retry-After header takes precedence over it.
+    """
+    RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = RETRYABLE_STATUSES, jitter: bool = True):
+        """
+        Args:
+            max_retries (int): Retries after the first attempt (default is 3).
+            backoff_base (float): Backoff of the first retry, in seconds (default is 0.5).
+            backoff_max (float): Upper bound of any backoff, in seconds (default is 30).
+            retry_statuses (tuple): HTTP statuses considered transient.
+            jitter (bool): Randomise each backoff between 0 and its exponential value (default is True).
+        """
+        self.lock = Lock()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = tuple(retry_statuses)
+        self.jitter = jitter
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+        retryable_exceptions = [requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError]
+        if aiohttp is not None:
+            retryable_exceptions += [aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError]
+        self.retryable_exceptions = tuple(retryable_exceptions)
+
+    def is_retryable(self, status_code: int) -> bool:
+        """Check if a response status is worth retrying."""
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt (int): Number of retries already made.
+            retry_after (Optional[float]): Delay requested by the server, in seconds.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+
+    def record(self, endpoint: str, event: str) -> None:
+        """Count a retry event ("retries" or "exhausted") for an endpoint."""
+        path = endpoint.split("?")[0]
+        with self.lock:
+            counters = self.counters.setdefault(path, {"retries": 0, "exhausted": 0})
+            counters[event] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the retry counters of every endpoint that needed a retry."""
+        with self.lock:
+            return {path: dict(counters) for path, counters in self.counters.items()}
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical operations into a single execution.
+
+    The first caller for a key runs the operation; callers arriving while it is in flight
+    wait for it and receive the same result (or exception). Results are shared, not copied.
+    """
+    _shared: Optional["SingleFlight"] = None
+    _shared_lock = Lock()
+
+    def __init__(self):
+        self.lock = Lock()
+        self.flights: Dict = {}
+        self.async_flights: Dict = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def get_shared(cls) -> "SingleFlight":
+        """Get the process-wide instance, creating it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _count(self, namespace: str, coalesced: bool) -> None:
+        counters = self.counters.setdefault(namespace, {"calls": 0, "executed": 0, "coalesced": 0})
+        counters["calls"] += 1
+        counters["coalesced" if coalesced else "executed"] += 1
+
+    def do(self, key, fn, namespace: str = "default"):
+        """
+        Run fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Hashable identity of the operation.
+            fn (callable): Operation to run when no identical call is in flight.
+            namespace (str): Name the call is counted under in stats().
+
+        Returns:
+            The result of fn.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = {"event": Event(), "result": None, "error": None}
+                self.flights[key] = flight
+            self._count(namespace, coalesced=not leader)
+
+        if not leader:
+            flight["event"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+
+        try:
+            flight["result"] = fn()
+            return flight["result"]
+        except BaseException as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight["event"].set()
+
+    async def do_async(self, key, fn, namespace: str = "default"):
+        """
+        The asyncio counterpart of do; fn must return an awaitable.
+        """
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            future = self.async_flights.get((loop, key))
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self.async_flights[(loop, key)] = future
+            self._count(namespace, coalesced=not leader)
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        finally:
+            with self.lock:
+                del self.async_flights[(loop, key)]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get calls, executions and coalesced calls per namespace."""
+        with self.lock:
+            return {namespace: dict(counters) for namespace, counters in self.counters.items()}
+
+
+class AsyncResponse:
+    """A fully read aiohttp response exposing the parts of requests.Response the wrapper uses."""
+    def __init__(self, status_code: int, body, headers):
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class AsyncSessionPool:
+    """
+    The asyncio counterpart of HTTPSessionPool, backed by a single aiohttp.ClientSession.
+
+    Requires the optional aiohttp dependency (pip install artifactsmmo-wrapper[async]).
+    """
+    _shared: Optional["AsyncSessionPool"] = None
+
+    def __init__(self, pool_maxsize: int = 100, keepalive_timeout: float = 30):
+        """
+        Args:
+            pool_maxsize (int): Maximum number of simultaneous connections (default is 100).
+            keepalive_timeout (float): Seconds an idle connection is kept open (default is 30).
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSessionPool requires aiohttp. Install it with: pip install artifactsmmo-wrapper[async]")
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_timeout = keepalive_timeout
+        self.requests_sent = 0
+        self.session = None
+        self._loop = None
+
+    @classmethod
+    def get_shared(cls, pool_maxsize: int = 100) -> "AsyncSessionPool":
+        """Get the process-wide async pool, creating it on first use."""
+        if cls._shared is None:
+            cls._shared = cls(pool_maxsize=pool_maxsize)
+        return cls._shared
+
+    def _get_session(self):
+        # A ClientSession is bound to the loop it was created in
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self.session
+
+    async def request(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        """Send a request through the pooled session and read the whole response."""
+        session = self._get_session()
+        self.requests_sent += 1
+        async with session.request(method, url, **kwargs) as response:
+            try:
+                body = await response.json(content_type=None)
+            except ValueError:
+                body = None
+            return AsyncResponse(response.status, body, response.headers)
+
+    def stats(self) -> Dict[str, int]:
+        """Get request statistics for the pool."""
+        return {
+            "requests": self.requests_sent,
+            "pool_maxsize": self.pool_maxsize,
+        }
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+
 # --- Dataclasses ---
 @dataclass
 class Position:
@@ -281,6 +852,204 @@ class Drop:
     min_quantity: int
     max_quantity: int
 
+@dataclass
+class DropSource:
+    """A monster or resource dropping an item, with the map tiles it can be found on."""
+    type: str
+    code: str
+    name: str
+    level: int
+    skill: str
+    rate: int
+    min_quantity: int
+    max_quantity: int
+    tiles: List[Position]
+
+    def __repr__(self) -> str:
+        return f"{self.name} ({self.type} {self.code}, {self.skill} level {self.level}): 1/{self.rate} at {self.tiles}"
+
+@dataclass
+class RouteStop:
+    """A stop of a planned route."""
+    name: str
+    pos: Position
+    content: Optional[dict] = None
+
+    def __iter__(self):
+        yield self.pos.x
+        yield self.pos.y
+
+@dataclass
+class Route:
+    """
+    Stops in visiting order with the total travel distance (in tiles) and move cooldown (in seconds).
+
+    Iterating a route yields its stops, which unpack to coordinates: `for x, y in route: actions.move(x, y)`.
+    """
+    stops: List[RouteStop]
+    distance: int
+    cooldown: float
+
+    def __iter__(self):
+        return iter(self.stops)
+
+    def __len__(self) -> int:
+        return len(self.stops)
+
+    def __repr__(self) -> str:
+        return " -> ".join(f"{stop.name} {stop.pos}" for stop in self.stops) + f" ({self.distance} tiles, {self.cooldown}s)"
+
+@dataclass
+class CombatOutcome:
+    """
+    Estimated outcome of a batch of fights, one entry per fight.
+
+    win_rate is 0 or 1 unless crits were sampled; turns counts the attacks of both sides and
+    hp_lost the character HP lost (all of it on a loss).
+    """
+    win_rate: "np.ndarray"
+    turns: "np.ndarray"
+    hp_lost: "np.ndarray"
+
+@dataclass
+class Loadout:
+    """
+    An equipment loadout with its objective score and the actions turning the current equipment into it.
+
+    Actions are (Actions method name, keyword arguments) pairs: bank withdrawals first (to be done at
+    a bank), then unequips, then equips.
+    """
+    slots: Dict[str, Optional[str]]
+    score: float
+    actions: List[Tuple[str, dict]]
+
+    def apply(self, actions: "Actions") -> list:
+        """
+        Perform the actions with the given Actions subsystem.
+
+        Args:
+            actions (Actions): The character's Actions, e.g. api.actions.
+
+        Returns:
+            list: The response of every action.
+        """
+        return [getattr(actions, name)(**kwargs) for name, kwargs in self.actions]
+
+@dataclass
+class PlanStep:
+    """
+    A step of a production plan, performed at (x, y).
+
+    Actions are "move", "withdraw" and "deposit" (quantity units of item_code), "deposit_all" (every
+    item in the inventory), "gather" and "fight" (repeated until the inventory holds quantity units
+    of item_code) and "craft" (quantity crafts of item_code). seconds is the estimated cooldown of the step.
+    """
+    action: str
+    x: int
+    y: int
+    item_code: Optional[str] = None
+    quantity: int = 0
+    seconds: float = 0.0
+
+    def __repr__(self) -> str:
+        if self.action == "move":
+            return f"move to ({self.x}, {self.y})"
+        if self.action == "deposit_all":
+            return "deposit the inventory"
+        return f"{self.action} {self.quantity} {self.item_code}"
+
+@dataclass
+class ProductionPlan:
+    """
+    The steps producing an item with their estimated total cooldown (in seconds).
+
+    missing holds the raw materials (and the items needing them) no reachable source drops, and
+    unmet_skills the crafting skills below the level the plan requires. Both are empty for a plan
+    that can be executed to completion.
+
+    keep holds the item codes the plan consumes or produces. When the inventory fills up during a
+    gather or fight, every other item is deposited at the bank tile before going on.
+    """
+    steps: List[PlanStep]
+    seconds: float
+    missing: Dict[str, int] = field(default_factory=dict)
+    unmet_skills: Dict[str, int] = field(default_factory=dict)
+    keep: set = field(default_factory=set)
+    bank: Optional[Position] = None
+
+    REST_BELOW = 0.5  # Rest before a fight when HP is below this fraction of max HP
+
+    def execute(self, api: "ArtifactsAPI") -> list:
+        """
+        Perform the steps with the character of an API instance.
+
+        Args:
+            api (ArtifactsAPI): The API whose character executes the plan.
+
+        Returns:
+            list: The response of every action.
+        """
+        responses = []
+        for step in self.steps:
+            for name, kwargs in self._step_actions(step, api.char):
+                responses.append(getattr(api.actions, name)(**kwargs))
+            while step.action in ("gather", "fight") and api.char.has_item(step.item_code)[1] < step.quantity:
+                if not api.char.can_fit(1):
+                    for name, kwargs in self._room_actions(step, api.char):
+                        responses.append(getattr(api.actions, name)(**kwargs))
+                if step.action == "fight" and api.char.hp < api.char.max_hp * self.REST_BELOW:
+                    responses.append(api.actions.rest())
+                responses.append(getattr(api.actions, step.action)())
+        return responses
+
+    async def execute_async(self, api: "AsyncArtifactsAPI") -> list:
+        """
+        Perform the steps with the character of an async API instance.
+
+        Args:
+            api (AsyncArtifactsAPI): The API whose character executes the plan.
+
+        Returns:
+            list: The response of every action.
+        """
+        responses = []
+        for step in self.steps:
+            for name, kwargs in self._step_actions(step, api.char):
+                responses.append(await getattr(api.actions, name)(**kwargs))
+            while step.action in ("gather", "fight") and api.char.has_item(step.item_code)[1] < step.quantity:
+                if not api.char.can_fit(1):
+                    for name, kwargs in self._room_actions(step, api.char):
+                        responses.append(await getattr(api.actions, name)(**kwargs))
+                if step.action == "fight" and api.char.hp < api.char.max_hp * self.REST_BELOW:
+                    responses.append(await api.actions.rest())
+                responses.append(await getattr(api.actions, step.action)())
+        return responses
+
+    @staticmethod
+    def _step_actions(step: PlanStep, char: "PlayerData") -> List[Tuple[str, dict]]:
+        if step.action == "move":
+            return [] if (char.pos.x, char.pos.y) == (step.x, step.y) else [("move", {"x": step.x, "y": step.y})]
+        if step.action == "withdraw":
+            return [("bank_withdraw_item", {"item_code": step.item_code, "quantity": step.quantity})]
+        if step.action == "deposit":
+            return [("bank_deposit_item", {"item_code": step.item_code, "quantity": step.quantity})]
+        if step.action == "deposit_all":
+            return [("bank_deposit_item", {"item_code": code, "quantity": count}) for code, count in char.get_inventory_counts().items()]
+        if step.action == "craft":
+            return [("craft_item", {"item_code": step.item_code, "quantity": step.quantity})]
+        return []
+
+    def _room_actions(self, step: PlanStep, char: "PlayerData") -> List[Tuple[str, dict]]:
+        """Actions taking the items the plan does not need to the bank and coming back to the step."""
+        deposits = [(code, count) for code, count in char.get_inventory_counts().items() if code not in self.keep]
+        if not deposits or self.bank is None:
+            # Nothing can be set aside: let the next action report the full inventory
+            return []
+        actions = [("move", {"x": self.bank.x, "y": self.bank.y})]
+        actions += [("bank_deposit_item", {"item_code": code, "quantity": count}) for code, count in deposits]
+        actions.append(("move", {"x": step.x, "y": step.y}))
+        return actions
+
 @dataclass
 class ContentMap:
     name: str
@@ -373,6 +1142,12 @@ class PlayerData:
     
     Attributes include levels, experience, stats, elemental attributes, 
     position, inventory, equipment slots, and task information.
+
+    Instances are slotted. from_payload builds one from a character payload and update refreshes
+    one in place, both through a loader generated from the field list.
+
+    ArtifactsAPI refreshes its character in place, so api.char is the same object across requests.
+    Keep a copy, e.g. dataclasses.replace(api.char), to compare the character before and after an action.
     """
     name: str
     account: str
@@ -463,6 +1238,56 @@ class PlayerData:
     inventory_max_items: int
     inventory: List[InventoryItem]
 
+    # One slot per field, plus the inventory index (item code -> quantity, total quantity), see reindex_inventory
+    __slots__ = tuple(__annotations__) + ("_inventory_counts", "_inventory_total")
+
+    def __post_init__(self):
+        self.reindex_inventory()
+
+    @classmethod
+    def from_payload(cls, data: dict) -> "PlayerData":
+        """
+        Build a player from the character payload of the API.
+
+        Args:
+            data (dict): The character data, e.g. the "data" field of GET /characters/{name}.
+
+        Returns:
+            PlayerData: The new player.
+        """
+        player = cls.__new__(cls)
+        player._load_payload(data)
+        return player
+
+    def update(self, data: dict) -> "PlayerData":
+        """
+        Refresh the player in place from the character payload of the API.
+
+        Args:
+            data (dict): The character data, e.g. the "data" field of GET /characters/{name}.
+
+        Returns:
+            PlayerData: The player itself.
+        """
+        self._load_payload(data)
+        return self
+
+    def reindex_inventory(self) -> None:
+        """
+        Rebuild the inventory index from the inventory list.
+
+        The index is built when the character is loaded or refreshed; call this after changing
+        the inventory list by hand.
+        """
+        self._inventory_counts, self._inventory_total = self._count_inventory(self.inventory)
+
+    @staticmethod
+    def _count_inventory(inventory: List[InventoryItem]) -> Tuple[Dict[str, int], int]:
+        counts: Dict[str, int] = {}
+        for item in inventory:
+            counts[item.code] = counts.get(item.code, 0) + item.quantity
+        return counts, sum(counts.values())
+
     def get_skill_progress(self, skill: str) -> Tuple[int, float]:
         """
         Get level and progress percentage for a given skill.
@@ -510,25 +1335,55 @@ class PlayerData:
         Returns:
             int: Number of available inventory slots.
         """
-        items = 0
-        for item in self.inventory:
-            items += item.quantity
-        return self.inventory_max_items - items
+        return self.inventory_max_items - self._inventory_total
 
-    def has_item(self, item_code: str) -> Tuple[bool, int]:
+    def can_fit(self, quantity: int = 1) -> bool:
         """
-        Check if the player has a specific item and its quantity.
-        
+        Check if the inventory has room for more items.
+
         Args:
-            item_code (str): The code of the item to check.
-        
+            quantity (int): Number of items to fit (default is 1).
+
+        Returns:
+            bool: True if the items fit in the remaining inventory space.
+        """
+        return quantity <= self.inventory_max_items - self._inventory_total
+
+    def get_inventory_counts(self) -> Dict[str, int]:
+        """
+        Get the quantity of every item in the inventory.
+
+        Returns:
+            dict: A copy of the inventory index, item code -> quantity.
+        """
+        return dict(self._inventory_counts)
+
+    def has_item(self, item_code: str) -> Tuple[bool, int]:
+        """
+        Check if the player has a specific item and its quantity.
+        
+        Args:
+            item_code (str): The code of the item to check.
+        
         Returns:
             tuple: A tuple with a boolean indicating presence and the quantity.
         """
-        for item in self.inventory:
-            if item.code == item_code:
-                return True, item.quantity
-        return False, 0
+        quantity = self._inventory_counts.get(item_code, 0)
+        return quantity > 0, quantity
+
+    def has_items(self, requirements: Dict[str, int]) -> Tuple[bool, Dict[str, int]]:
+        """
+        Check if the player has every item of a list, e.g. the materials of a recipe.
+
+        Args:
+            requirements (dict): Item code -> quantity needed.
+
+        Returns:
+            tuple: A tuple with a boolean indicating if all items are present and the missing quantity per item code.
+        """
+        counts = self._inventory_counts
+        missing = {code: quantity - counts.get(code, 0) for code, quantity in requirements.items() if counts.get(code, 0) < quantity}
+        return not missing, missing
 
     def get_task_progress_percentage(self) -> float:
         """
@@ -553,9 +1408,629 @@ class PlayerData:
   Cooking Level {self.cooking_level} ({self.cooking_xp}/{self.cooking_max_xp} XP)
         """
         return ret
+
+
+def _compile_payload_loader(cls) -> Callable[[object, dict], None]:
+    """
+    Generate a function assigning every field of a dataclass from an API payload.
+
+    Fields are read from the payload key of the same name, except pos (from x and y) and
+    inventory (from the non-empty inventory slots). The generated function is straight-line code,
+    with no per-field lookups or keyword argument handling. Every value, the inventory index
+    included, is read into a local before the first attribute is stored, so a payload missing a key
+    raises KeyError with the instance untouched, and the stores follow one another with no work in between.
+    """
+    reads = [
+        "def load_payload(self, data):",
+        "    inventory = [InventoryItem(item['slot'], item['code'], item['quantity']) "
+        "for item in data.get('inventory') or () if item['code']]",
+        "    counts, total = self._count_inventory(inventory)",
+    ]
+    stores = []
+    for attribute in fields(cls):
+        if attribute.name == "pos":
+            reads.append("    value_pos = Position(data['x'], data['y'])")
+            stores.append("    self.pos = value_pos")
+        elif attribute.name != "inventory":
+            reads.append(f"    value_{attribute.name} = data[{attribute.name!r}]")
+            stores.append(f"    self.{attribute.name} = value_{attribute.name}")
+    stores.append("    self.inventory, self._inventory_counts, self._inventory_total = inventory, counts, total")
+    namespace = {"Position": Position, "InventoryItem": InventoryItem}
+    exec("\n".join(reads + stores), namespace)
+    return namespace["load_payload"]
+
+PlayerData._load_payload = _compile_payload_loader(PlayerData)
 # --- End Dataclasses ---
 
 
+class SnapshotStore:
+    """
+    An on-disk SQLite snapshot of the static game data, used to skip the API crawl on start-up.
+
+    Each collection is stored as compressed JSON together with the snapshot format version,
+    the server version it was downloaded from and the time it was saved.
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str, ttl: float = 86400, check_server_version: bool = True):
+        """
+        Args:
+            path (str): Path of the SQLite database file.
+            ttl (float): Seconds after which a snapshot is stale (default is one day).
+            check_server_version (bool): Discard snapshots taken from another server version (default is True).
+        """
+        self.path = path
+        self.ttl = ttl
+        self.check_server_version = check_server_version
+        self.lock = Lock()
+        try:
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS snapshots ("
+                    "name TEXT PRIMARY KEY, schema_version INTEGER, server_version TEXT, saved_at REAL, data BLOB)"
+                )
+        except sqlite3.DatabaseError as e:
+            # Reads then miss and writes are skipped, so the collections are crawled as without a snapshot
+            logger.warning(f"Could not open the snapshot {self.path}: {e}", extra={"char": "Unknown"})
+
+    def read(self, name: str, server_version: Optional[str] = None) -> Optional[list]:
+        """
+        Read a collection from the snapshot.
+
+        Args:
+            name (str): Collection name.
+            server_version (Optional[str]): Current server version; not compared when None.
+
+        Returns:
+            Optional[list]: The records, or None if the snapshot is missing, stale, outdated or unreadable.
+        """
+        try:
+            with closing(sqlite3.connect(self.path)) as conn:
+                row = conn.execute(
+                    "SELECT schema_version, server_version, saved_at, data FROM snapshots WHERE name = ?", (name,)
+                ).fetchone()
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Could not read the {name} snapshot from {self.path}, crawling instead: {e}", extra={"char": "Unknown"})
+            return None
+        if row is None:
+            return None
+        schema_version, saved_version, saved_at, data = row
+        if schema_version != self.SCHEMA_VERSION:
+            return None
+        if time.time() - saved_at > self.ttl:
+            return None
+        if self.check_server_version and server_version is not None and saved_version != server_version:
+            return None
+        try:
+            return json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError) as e:
+            # ValueError covers json.JSONDecodeError and undecodable UTF-8
+            logger.warning(f"The {name} snapshot in {self.path} is corrupt, crawling instead: {e}", extra={"char": "Unknown"})
+            return None
+
+    def write(self, name: str, records: list, server_version: Optional[str] = None) -> None:
+        """Save a collection to the snapshot, replacing the previous one. A database that cannot be written is logged and skipped."""
+        data = zlib.compress(json.dumps(records, separators=(",", ":")).encode("utf-8"))
+        try:
+            with self.lock, closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (name, schema_version, server_version, saved_at, data) VALUES (?, ?, ?, ?, ?)",
+                    (name, self.SCHEMA_VERSION, server_version, time.time(), data),
+                )
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Could not save the {name} snapshot to {self.path}: {e}", extra={"char": "Unknown"})
+
+
+class StaticDataStore:
+    """
+    A process-wide, thread-safe store of the static game data (items, maps, monsters, ...).
+
+    Every wrapper instance reads its collections from the shared store, so the catalog is
+    downloaded and held in memory once per process, and refreshed in one place.
+    """
+    # Collection name -> (endpoint, request source, key function)
+    COLLECTIONS = {
+        "items": ("items", "get_all_items", lambda record: record["code"]),
+        "maps": ("maps", "get_all_maps", lambda record: f"{record['x']}/{record['y']}"),
+        "monsters": ("monsters", "get_all_monsters", lambda record: record["code"]),
+        "resources": ("resources", "get_all_resources", lambda record: record["code"]),
+        "tasks": ("tasks/list", "get_all_tasks", lambda record: record["code"]),
+        "rewards": ("tasks/rewards", "get_all_task_rewards", lambda record: record["code"]),
+        "achievements": ("achievements", "get_all_achievements", lambda record: record["code"]),
+    }
+    # Collection name -> text fields searched through a TextIndex, matching the regex QUERY_FIELDS
+    TEXT_FIELDS = {
+        "items": ("name",),
+        "monsters": ("name",),
+        "tasks": ("name",),
+        "rewards": ("name",),
+        "achievements": ("name", "description"),
+    }
+    _shared: Optional["StaticDataStore"] = None
+    _shared_lock = Lock()
+
+    def __init__(self):
+        self.lock = Lock()
+        self.collections: Dict[str, Dict] = {}
+        self.snapshot: Optional[SnapshotStore] = None
+        self.server_version: Optional[str] = None
+        self.generation = itertools.count(1)
+        self.derived: Dict[str, Tuple[tuple, object]] = {}
+
+    @classmethod
+    def get_shared(cls) -> "StaticDataStore":
+        """Get the process-wide store, creating it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def records(self, name: str) -> list:
+        """Get the records of a collection, or an empty list if it is not loaded."""
+        collection = self.collections.get(name)
+        return collection["records"] if collection else []
+
+    def index(self, name: str) -> dict:
+        """Get the records of a collection keyed by code (or "x/y" for maps)."""
+        collection = self.collections.get(name)
+        return collection["index"] if collection else {}
+
+    def query_engine(self, name: str, fields: Dict[str, "QueryField"], index=None) -> "QueryEngine":
+        """
+        Build a query engine over a collection, reusing the text indexes built when it was loaded.
+
+        Args:
+            name (str): Collection name.
+            fields (dict): Supported filter keys and how they are matched.
+            index: Optional secondary index of the collection, like ItemIndex.
+
+        Returns:
+            QueryEngine: The engine, empty if the collection is not loaded.
+        """
+        with self.lock:
+            collection = self.collections.get(name)
+        if collection is None:
+            return QueryEngine([], fields, index=index)
+        return QueryEngine(collection["records"], fields, index=index, text_indexes=collection["text"])
+
+    def is_loaded(self, name: str) -> bool:
+        """Check if a collection has been loaded."""
+        return name in self.collections
+
+    def set(self, name: str, records: list, load_time: float = 0.0) -> None:
+        """
+        Replace the records of a collection, building its code index and the text indexes of its TEXT_FIELDS.
+
+        Args:
+            name (str): Collection name, one of COLLECTIONS.
+            records (list): The new records.
+            load_time (float): Seconds it took to obtain the records.
+        """
+        key = self.COLLECTIONS[name][2]
+        with self.lock:
+            current = self.collections.get(name)
+            if current is not None and current["records"] is records:
+                return
+        index = {key(record): record for record in records}
+        text = {field: TextIndex(records, lambda record, field=field: record.get(field)) for field in self.TEXT_FIELDS.get(name, ())}
+        with self.lock:
+            self.collections[name] = {
+                "records": records,
+                "index": index,
+                "text": text,
+                "loaded_at": datetime.now(timezone.utc),
+                "load_time": load_time,
+                "generation": next(self.generation),
+            }
+
+    def derive(self, key: str, names: Tuple[str, ...], builder):
+        """
+        Get a structure computed from one or more collections, such as a secondary index.
+
+        The structure is built on first use and rebuilt whenever one of its collections is reloaded,
+        so it always stays in sync with the cached data.
+
+        Args:
+            key (str): Unique name of the derived structure.
+            names (tuple): Collections the structure is computed from.
+            builder (callable): Builds the structure from the current collections.
+
+        Returns:
+            The derived structure.
+        """
+        with self.lock:
+            generations = tuple(self.collections[name]["generation"] if name in self.collections else 0 for name in names)
+            cached = self.derived.get(key)
+        if cached is not None and cached[0] == generations:
+            return cached[1]
+
+        value = builder()
+        with self.lock:
+            self.derived[key] = (generations, value)
+        return value
+
+    def use_snapshot(self, path: str, ttl: float = 86400, check_server_version: bool = True) -> SnapshotStore:
+        """
+        Read collections from an on-disk snapshot before crawling the API, and save crawls to it.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            ttl (float): Seconds after which a snapshot is stale (default is one day).
+            check_server_version (bool): Discard snapshots taken from another server version (default is True).
+
+        Returns:
+            SnapshotStore: The snapshot now in use.
+        """
+        self.snapshot = SnapshotStore(path, ttl=ttl, check_server_version=check_server_version)
+        return self.snapshot
+
+    def _get_server_version(self, api: "ArtifactsAPI") -> Optional[str]:
+        """Get the server version once per process, if the snapshot needs it."""
+        if self.snapshot is None or not self.snapshot.check_server_version:
+            return None
+        if self.server_version is None:
+            try:
+                self.server_version = api._get_data("", source="get_status").get("version")
+            except Exception as e:
+                logger.warning(f"Could not get the server version, relying on the snapshot TTL: {e}", extra={"char": api.character_name})
+        return self.server_version
+
+    async def _get_server_version_async(self, api: "AsyncArtifactsAPI") -> Optional[str]:
+        if self.snapshot is None or not self.snapshot.check_server_version:
+            return None
+        if self.server_version is None:
+            try:
+                self.server_version = (await api._get_data("", source="get_status")).get("version")
+            except Exception as e:
+                logger.warning(f"Could not get the server version, relying on the snapshot TTL: {e}", extra={"char": api.character_name})
+        return self.server_version
+
+    def load(self, name: str, api: "ArtifactsAPI", refresh: bool = False) -> list:
+        """
+        Load a collection unless it is already loaded.
+
+        The snapshot, if any, is read first; the API is only crawled when it is stale.
+
+        Args:
+            name (str): Collection name, one of COLLECTIONS.
+            api (ArtifactsAPI): Wrapper used to fetch the collection.
+            refresh (bool): Crawl the API even if the collection is loaded or snapshotted (default is False).
+
+        Returns:
+            list: The records of the collection.
+        """
+        if refresh or not self.is_loaded(name):
+            path, source, _ = self.COLLECTIONS[name]
+            start = time.perf_counter()
+            server_version = self._get_server_version(api)
+            records = None
+            if self.snapshot is not None and not refresh:
+                records = self.snapshot.read(name, server_version)
+            if records is None:
+                records = api._load_collection(path, source=source)
+                if self.snapshot is not None:
+                    self.snapshot.write(name, records, server_version)
+            self.set(name, records, time.perf_counter() - start)
+        return self.records(name)
+
+    async def load_async(self, name: str, api: "AsyncArtifactsAPI", refresh: bool = False) -> list:
+        """The asyncio counterpart of load."""
+        if refresh or not self.is_loaded(name):
+            path, source, _ = self.COLLECTIONS[name]
+            start = time.perf_counter()
+            server_version = await self._get_server_version_async(api)
+            records = None
+            if self.snapshot is not None and not refresh:
+                records = self.snapshot.read(name, server_version)
+            if records is None:
+                records = await api._load_collection(path, source=source)
+                if self.snapshot is not None:
+                    self.snapshot.write(name, records, server_version)
+            self.set(name, records, time.perf_counter() - start)
+        return self.records(name)
+
+    def refresh(self, api: "ArtifactsAPI", names: Optional[List[str]] = None) -> None:
+        """
+        Reload collections for every instance at once.
+
+        Args:
+            api (ArtifactsAPI): Wrapper used to fetch the collections.
+            names (Optional[list]): Collections to reload; defaults to every loaded collection.
+        """
+        for name in names or list(self.collections):
+            self.load(name, api, refresh=True)
+
+    @staticmethod
+    def _deep_sizeof(obj, seen: Optional[set] = None) -> int:
+        """Approximate the memory held by an object graph, in bytes."""
+        if seen is None:
+            seen = set()
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            size += sum(StaticDataStore._deep_sizeof(k, seen) + StaticDataStore._deep_sizeof(v, seen) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple, set)):
+            size += sum(StaticDataStore._deep_sizeof(item, seen) for item in obj)
+        return size
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Get the size, approximate memory footprint and load time of every loaded collection.
+
+        Returns:
+            dict: Collection name to records, bytes, load_time (seconds) and loaded_at.
+        """
+        with self.lock:
+            collections = dict(self.collections)
+        return {
+            name: {
+                "records": len(collection["records"]),
+                "bytes": self._deep_sizeof(collection["records"]),
+                "load_time": collection["load_time"],
+                "loaded_at": collection["loaded_at"],
+            }
+            for name, collection in collections.items()
+        }
+
+
+class BankMirror:
+    """
+    A local copy of an account's bank, shared by every wrapper instance using the same token.
+
+    The mirror is loaded once with every page of the bank, then kept current from the bank
+    contents returned by each deposit and withdrawal, so lookups rarely hit the API. It is
+    reloaded from the server when it is older than reconcile_interval seconds, which catches
+    changes made outside the wrapper.
+
+    Lookups (get, in, snapshot) only read the local copy and never hit the API. Load or reconcile
+    it first through the calling character's own instance with ``api.get_bank()`` (or
+    ``await api.get_bank()``), so the requests wait on that character's cooldown only.
+    """
+    RECONCILE_INTERVAL = 300
+    # Request source -> what its response describes
+    ITEM_SOURCES = ("bank_deposit_item", "bank_withdraw_item")
+    GOLD_SOURCES = ("bank_deposit_gold", "bank_withdraw_gold")
+    _mirrors: Dict[str, "BankMirror"] = {}
+    _mirrors_lock = Lock()
+
+    def __init__(self, reconcile_interval: float = RECONCILE_INTERVAL):
+        """
+        Args:
+            reconcile_interval (float): Seconds after which sync() reloads the bank from the server.
+        """
+        self.reconcile_interval = reconcile_interval
+        self.lock = Lock()
+        self.items: Dict[str, int] = {}
+        self.gold: int = 0
+        self.details: dict = {}
+        self.synced_at: Optional[float] = None
+        self.version = 0
+        self.applied = 0
+
+    @classmethod
+    def for_token(cls, token: str, reconcile_interval: float = RECONCILE_INTERVAL) -> "BankMirror":
+        """
+        Get the mirror of an account, creating it on first use.
+
+        The reconcile interval is only used when the account has no mirror yet.
+        """
+        with cls._mirrors_lock:
+            if token not in cls._mirrors:
+                cls._mirrors[token] = cls(reconcile_interval)
+            return cls._mirrors[token]
+
+    def get(self, item_code: str) -> int:
+        """Get the quantity of an item in the bank, 0 if there is none."""
+        return self.items.get(item_code, 0)
+
+    def __contains__(self, item_code: str) -> bool:
+        return item_code in self.items
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get a copy of the bank contents, item code -> quantity."""
+        with self.lock:
+            return dict(self.items)
+
+    def is_stale(self) -> bool:
+        """Check if the mirror has never been loaded or is due for reconciliation."""
+        return self.synced_at is None or time.monotonic() - self.synced_at >= self.reconcile_interval
+
+    def invalidate(self) -> None:
+        """Reload the bank from the server on the next sync()."""
+        self.synced_at = None
+
+    def sync(self, api: "ArtifactsAPI", force: bool = False) -> "BankMirror":
+        """
+        Load the bank if the mirror is stale.
+
+        Concurrent syncs of the same account, from any instance, share a single load.
+
+        Args:
+            api (ArtifactsAPI): Wrapper used to fetch the bank.
+            force (bool): Reload even if the mirror is current (default is False).
+
+        Returns:
+            BankMirror: The mirror itself.
+        """
+        if force or self.is_stale():
+            api.single_flight.do(("bank", api.token), lambda: self._load(api), namespace="bank")
+        return self
+
+    async def sync_async(self, api: "AsyncArtifactsAPI", force: bool = False) -> "BankMirror":
+        """The asyncio counterpart of sync."""
+        if force or self.is_stale():
+            await api.single_flight.do_async(("bank", api.token), lambda: self._load_async(api), namespace="bank")
+        return self
+
+    def _load(self, api: "ArtifactsAPI") -> None:
+        version = self.version
+        items = self._count(api.account.iter_bank_items())
+        details = api.account.get_bank_details().get("data") or {}
+        self._replace(items, details, version, api)
+
+    async def _load_async(self, api: "AsyncArtifactsAPI") -> None:
+        version = self.version
+        items = self._count([record async for record in api.account.iter_bank_items()])
+        details = (await api.account.get_bank_details()).get("data") or {}
+        self._replace(items, details, version, api)
+
+    @staticmethod
+    def _count(records) -> Dict[str, int]:
+        items: Dict[str, int] = {}
+        for record in records:
+            items[record["code"]] = items.get(record["code"], 0) + record["quantity"]
+        return items
+
+    def _replace(self, items: Dict[str, int], details: dict, version: int, api: "ArtifactsAPI") -> None:
+        with self.lock:
+            if self.version != version:
+                # A bank action completed during the load, so the listing may predate it; keep the
+                # items and gold from its response, which are at least as recent, and the rest of the details
+                logger.debug("Bank changed while it was loading, keeping the newer state", extra={"char": api.char.name})
+                self.details = {**details, "gold": self.gold}
+            else:
+                self.items = items
+                self.details = details
+                self.gold = details.get("gold", self.gold)
+            self.synced_at = time.monotonic()
+        logger.debug(f"Mirrored {len(items)} bank items and {self.gold} gold", extra={"char": api.char.name})
+
+    def apply(self, source: Optional[str], res: dict) -> bool:
+        """
+        Update the mirror from the response of a bank action.
+
+        Item deposits and withdrawals return the full item listing, so they also count as a sync.
+
+        Args:
+            source (Optional[str]): Name of the method that sent the request.
+            res (dict): Decoded JSON response.
+
+        Returns:
+            bool: True if the response updated the mirror.
+        """
+        data = res.get("data") if isinstance(res, dict) else None
+        bank = data.get("bank") if isinstance(data, dict) else None
+        with self.lock:
+            if source in self.ITEM_SOURCES and isinstance(bank, list):
+                self.items = self._count(bank)
+                self.synced_at = time.monotonic()
+            elif source in self.GOLD_SOURCES and isinstance(bank, dict) and "quantity" in bank:
+                self.gold = bank["quantity"]
+                self.details["gold"] = self.gold
+            else:
+                return False
+            self.version += 1
+            self.applied += 1
+        return True
+
+
+class Paginator:
+    """
+    Lazily iterates over every record of a paginated list endpoint.
+
+    Records are yielded page by page while the next page is prefetched in the background,
+    so memory stays bounded to two pages however long the listing is.
+    """
+    def __init__(self, api: "ArtifactsAPI", endpoint: str, source: Optional[str] = None, page_size: int = 100,
+                 max_items: Optional[int] = None, prefetch: bool = True, start_page: int = 1):
+        """
+        Args:
+            api (ArtifactsAPI): Wrapper used to send the requests.
+            endpoint (str): List endpoint, with its filters but without size and page parameters.
+            source (Optional[str]): Name of the calling method, used for logging.
+            page_size (int): Records requested per page (default is 100).
+            max_items (Optional[int]): Stop after yielding this many records.
+            prefetch (bool): Fetch the next page while the current one is consumed (default is True).
+            start_page (int): First page to read (default is 1).
+        """
+        self.api = api
+        self.endpoint = endpoint
+        self.source = source
+        self.page_size = page_size
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.start_page = start_page
+
+    def _page_endpoint(self, page: int) -> str:
+        endpoint = self.endpoint.rstrip("?&")
+        separator = "&" if "?" in endpoint else "?"
+        return f"{endpoint}{separator}size={self.page_size}&page={page}"
+
+    def _has_next(self, res: dict, page: int) -> bool:
+        data = res.get("data") or []
+        if res.get("pages") is not None:
+            return page < int(res["pages"])
+        return len(data) == self.page_size
+
+    def _wants_more(self, yielded: int) -> bool:
+        return self.max_items is None or yielded < self.max_items
+
+    def _fetch(self, page: int) -> dict:
+        return self.api._make_request("GET", self._page_endpoint(page), source=self.source)
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        try:
+            page = self.start_page
+            yielded = 0
+            res = self._fetch(page)
+            while True:
+                data = res.get("data") or []
+                has_next = self._has_next(res, page)
+                upcoming = None
+                if executor and has_next and self._wants_more(yielded + len(data)):
+                    upcoming = executor.submit(self._fetch, page + 1)
+
+                for record in data:
+                    if not self._wants_more(yielded):
+                        return
+                    yield record
+                    yielded += 1
+
+                if not has_next or not self._wants_more(yielded):
+                    return
+                page += 1
+                res = upcoming.result() if upcoming else self._fetch(page)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+
+class AsyncPaginator(Paginator):
+    """The asyncio counterpart of Paginator, used with ``async for``."""
+    def __iter__(self):
+        raise TypeError("AsyncPaginator must be iterated with 'async for'")
+
+    async def __aiter__(self):
+        page = self.start_page
+        yielded = 0
+        res = await self._fetch(page)
+        upcoming = None
+        try:
+            while True:
+                data = res.get("data") or []
+                has_next = self._has_next(res, page)
+                if self.prefetch and has_next and self._wants_more(yielded + len(data)):
+                    upcoming = asyncio.ensure_future(self._fetch(page + 1))
+
+                for record in data:
+                    if not self._wants_more(yielded):
+                        return
+                    yield record
+                    yielded += 1
+
+                if not has_next or not self._wants_more(yielded):
+                    return
+                page += 1
+                res = await upcoming if upcoming else await self._fetch(page)
+                upcoming = None
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+
+
 class Account:
     def __init__(self, api: "ArtifactsAPI"):
         """
@@ -597,6 +2072,22 @@ class Account:
         endpoint = f"my/grandexchange/history?{query}"
         return self.api._make_request("GET", endpoint, source="get_ge_sell_history")
 
+    def iter_bank_items(self, item_code=None, max_items: Optional[int] = None) -> Paginator:
+        """Iterate lazily over every item stored in the player's bank, across all pages."""
+        query = f"item_code={item_code}" if item_code else ""
+        return self.api.paginate(f"my/bank/items?{query}", source="get_bank_items", max_items=max_items)
+
+    def iter_ge_sell_orders(self, item_code=None, max_items: Optional[int] = None) -> Paginator:
+        """Iterate lazily over the player's current sell orders, across all pages."""
+        query = f"item_code={item_code}" if item_code else ""
+        return self.api.paginate(f"my/grandexchange/orders?{query}", source="get_ge_sell_orders", max_items=max_items)
+
+    def iter_ge_sell_history(self, item_code=None, item_id=None, max_items: Optional[int] = None) -> Paginator:
+        """Iterate lazily over the player's Grand Exchange sell history, across all pages."""
+        query = f"item_code={item_code}" if item_code else ""
+        query += f"&id={item_id}" if item_id else ""
+        return self.api.paginate(f"my/grandexchange/history?{query.strip('&')}", source="get_ge_sell_history", max_items=max_items)
+
     def get_account_details(self) -> dict:
         """Retrieve details of the player's account."""
         endpoint = "my/details"
@@ -643,7 +2134,8 @@ class Character:
         return self.api._make_request("POST", endpoint, json=json, source="delete_character")
 
     def get_logs(self, page: int = 1) -> dict:
-        """_summary_
+        """
+        Retrieve the logs of the account's characters.
 
         Args:
             page (int): Page number for results. Defaults to 1.
@@ -653,7 +2145,19 @@ class Character:
         """
         query = f"size=100&page={page}"
         endpoint = f"my/logs?{query}"
-        self.api._make_request("GET", endpoint, source="get_logs")
+        return self.api._make_request("GET", endpoint, source="get_logs")
+
+    def iter_logs(self, max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over the logs of the account's characters, across all pages.
+
+        Args:
+            max_items (Optional[int]): Stop after this many log entries.
+
+        Returns:
+            Paginator: An iterator over log entries.
+        """
+        return self.api.paginate("my/logs", source="get_logs", max_items=max_items)
 
 class Actions:
     def __init__(self, api: "ArtifactsAPI"):
@@ -998,151 +2502,2009 @@ class Actions:
         res = self.api._make_request("POST", endpoint, source="cancel_task")
         return res
  
-class Items:
-    def __init__(self, api):
-        self.api = api
-        self.cache = {}
-        self.all_items = []
-    
-    def _cache_items(self):
-        endpoint = "items?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_items")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        m = f"Caching {pages} pages of items"
-        logger.debug(m, extra={"char": self.api.char.name})
-        
-        all_items = []
-        for i in range(pages):
-            endpoint = f"items?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_items")
-            item_list = res["data"]
-            all_items.extend(item_list)
-            
-            # Log the number of items fetched in each page
-            logger.debug(f"Fetched {len(item_list)} items from page {i+1}", extra={"char": self.api.char.name})
-        
-        self.cache = {item['code']: item for item in all_items}
-        self.all_items = all_items
-        
-        logger.debug(f"Finished caching {len(all_items)} items", extra={"char": self.api.char.name})
-    
-    def _filter_items(self, params):
-        # Initialize the filtered list with all items
-        logger.debug(f"Filtering items with params: {params}", extra={"char": self.api.char.name})
-        
-        filtered_items = self.all_items
-        
-        or_conditions = {}
-        for key, value in params.items():
-            if key.startswith("~"):
-                key = key[1:]
-                if key not in or_conditions:
-                    or_conditions[key] = []
-                or_conditions[key].append(value)
-                logger.debug(f"OR condition for {key}: {value}", extra={"char": self.api.char.name})
-            else:
-                logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-                
-                if key == 'craft_material':
-                    filtered_items = [item for item in filtered_items if item.get('craft') and any(material['code'] == value for material in item['craft'].get('items', []))]
-                    logger.debug(f"Filtered by craft_material: {value}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
-                elif key == 'craft_skill':
-                    filtered_items = [item for item in filtered_items if item.get('craft') and item['craft']['skill'] == value]
-                    logger.debug(f"Filtered by craft_skill: {value}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
-                elif key == 'max_level':
-                    filtered_items = [item for item in filtered_items if item['level'] <= value]
-                    logger.debug(f"Filtered by max_level: {value}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
-                elif key == 'min_level':
-                    filtered_items = [item for item in filtered_items if item['level'] >= value]
-                    logger.debug(f"Filtered by min_level: {value}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
-                elif key == 'name':
-                    name_pattern = re.compile(value, re.IGNORECASE)
-                    filtered_items = [item for item in filtered_items if name_pattern.search(item['name'])]
-                    logger.debug(f"Filtered by name: {value}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
-                elif key == 'item_type':
-                    filtered_items = [item for item in filtered_items if item['type'] == value]
-                    logger.debug(f"Filtered by item_type: {value}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern":
+    """Compile a case-insensitive search pattern, reusing it across queries."""
+    return re.compile(pattern, re.IGNORECASE)
+
+def _content_field(map_item: dict, field: str) -> Optional[str]:
+    """Read the content code or type of a map, whether it is nested ({"type", "code"}) or flat."""
+    content = map_item.get('content')
+    if isinstance(content, dict):
+        return content.get(field)
+    if field == 'code':
+        return content
+    return map_item.get('content_type')
+
+
+class QueryField:
+    """
+    How a filter parameter is matched against a record.
 
-        for key, values in or_conditions.items():
-            filtered_items = [item for item in filtered_items if any(item.get(key) == v for v in values)]
-            logger.debug(f"Applied OR condition for {key} with values: {values}. Remaining items: {len(filtered_items)}", extra={"char": self.api.char.name})
-        
-        logger.debug(f"Filtering complete. Total items after filtering: {len(filtered_items)}", extra={"char": self.api.char.name})
-        return filtered_items
+    Kinds:
+        - "eq": the field equals the value
+        - "regex": the field matches the value as a case-insensitive pattern
+        - "min" / "max": the field is at least / at most the value
+        - "any": one of the entries listed in the field has `attr` equal to the value
+    """
+    # Relative cost of evaluating each kind, used to break selectivity ties
+    COSTS = {"eq": 1, "min": 1, "max": 1, "any": 3, "regex": 5}
 
-    def get_item(self, params):
-        logger.debug(f"Getting item with params: {params}", extra={"char": self.api.char.name})
-        
-        if not self.all_items:
-            logger.debug("Cache is empty, calling _cache_items() to load items.", extra={"char": self.api.char.name})
-            self._cache_items()
+    def __init__(self, kind: str, getter, attr: Optional[str] = None, default=None):
+        """
+        Args:
+            kind (str): One of COSTS.
+            getter (callable): Reads the field from a record.
+            attr (str): Key compared inside each entry, for the "any" kind.
+            default: Value used when the field is missing, for the "min" and "max" kinds.
+        """
+        self.kind = kind
+        self.getter = getter
+        self.attr = attr
+        self.default = default
+        self.cost = self.COSTS[kind]
+
+    @classmethod
+    def key(cls, kind: str, key: str, **kwargs) -> "QueryField":
+        """Build a field that reads a top-level key of the record."""
+        return cls(kind, lambda record: record.get(key), **kwargs)
+
+    def predicate(self, value):
+        """Compile the field against a value into a predicate over records."""
+        getter = self.getter
+        if self.kind == "eq":
+            return lambda record: getter(record) == value
+        if self.kind == "regex":
+            search = _compile_pattern(value).search
+            return lambda record: bool(search(getter(record) or ''))
+        if self.kind == "min":
+            default = self.default
+            return lambda record: (getter(record) if getter(record) is not None else default) >= value
+        if self.kind == "max":
+            default = self.default
+            return lambda record: (getter(record) if getter(record) is not None else default) <= value
+        attr = self.attr
+        return lambda record: any(entry.get(attr) == value for entry in getter(record) or ())
+
+
+class TextIndex:
+    """
+    Case-insensitive substring search over one text field of a collection.
 
-        if "item_code" in params:
-            item = self.cache.get(params["item_code"])
-            if item:
-                logger.debug(f"Found item with code {params['item_code']}", extra={"char": self.api.char.name})
-            else:
-                logger.debug(f"Item with code {params['item_code']} not found in cache", extra={"char": self.api.char.name})
-            return item
-        
-        filtered_items = self._filter_items(params)
-        logger.debug(f"Returning {len(filtered_items)} filtered items", extra={"char": self.api.char.name})
-        return filtered_items
+    Every suffix of every whitespace-separated token is kept in a sorted list, so the records holding
+    a token that contains a given string are found with two bisections. Candidates are then verified
+    against the full lowercased text, which makes the results identical to a case-insensitive regex
+    search for the same literal string.
+    """
+    # Characters giving a query a meaning beyond its literal text
+    PATTERN_CHARS = frozenset(".^$*+?{}[]\\|()")
 
-class Maps:
-    def __init__(self, api: "ArtifactsAPI"):
-        self.api = api
-        self.cache = {}
-        self.all_maps = []
+    def __init__(self, records: list, getter):
+        """
+        Args:
+            records (list): The collection to index.
+            getter (callable): Reads the text field from a record.
+        """
+        self.texts = [(getter(record) or '').lower() for record in records]
+        entries = []
+        for position, text in enumerate(self.texts):
+            for token in set(text.split()):
+                for start in range(len(token)):
+                    entries.append((token[start:], position))
+        entries.sort()
+        self.suffixes = [suffix for suffix, _ in entries]
+        self.positions = [position for _, position in entries]
+
+    @classmethod
+    def is_plain(cls, query) -> bool:
+        """Check if a query can be answered by the index, i.e. it is a non-blank literal ASCII string."""
+        return isinstance(query, str) and query.isascii() and bool(query.strip()) and not cls.PATTERN_CHARS.intersection(query)
+
+    def search(self, query: str) -> set:
+        """
+        Find the records whose text contains a literal string, ignoring case.
 
-    def _cache_maps(self):
-        endpoint = "maps?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_maps")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        logger.debug(f"Caching {pages} pages of maps", extra={"char": self.api.char.name})
-        
-        all_maps = []
-        for i in range(pages):
-            endpoint = f"maps?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_maps")
-            map_list = res["data"]
-            all_maps.extend(map_list)
-            logger.debug(f"Fetched {len(map_list)} maps from page {i+1}", extra={"char": self.api.char.name})
-        
-        self.cache = {f"{item['x']}/{item['y']}": item for item in all_maps}
-        self.all_maps = all_maps
-        
-        logger.debug(f"Finished caching {len(all_maps)} maps", extra={"char": self.api.char.name})
+        Args:
+            query (str): A plain query, see is_plain.
 
-    def _filter_maps(self, params):
-        logger.debug(f"Filtering maps with params: {params}", extra={"char": self.api.char.name})
-        
-        filtered_maps = self.all_maps
-        
-        for key, value in params.items():
-            logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-            
-            if key == 'map_content':
-                content_pattern = re.compile(value, re.IGNORECASE)
-                filtered_maps = [map_item for map_item in filtered_maps if content_pattern.search(map_item.get('content', ''))]
-            elif key == 'content_type':
-                filtered_maps = [map_item for map_item in filtered_maps if map_item.get('content_type') == value]
+        Returns:
+            set: Positions of the matching records.
+        """
+        query = query.lower()
+        # Each whitespace-separated piece of the query lies within a single token of a matching text
+        piece = max(query.split(), key=len)
+        start = bisect_left(self.suffixes, piece)
+        end = bisect_left(self.suffixes, piece + "\uffff", start)
+        texts = self.texts
+        return {position for position in set(self.positions[start:end]) if query in texts[position]}
+
+
+class Query:
+    """A filter compiled once into predicates, ordered from the most to the least selective."""
+    def __init__(self, predicates: list, index_params: Optional[dict] = None, text_lookups: Optional[list] = None):
+        """
+        Args:
+            predicates (list): (selectivity, cost, predicate) tuples, already ordered.
+            index_params (dict): Parameters answered by the collection's secondary index, if any.
+            text_lookups (list): (TextIndex, query) pairs answering plain text searches, if any.
+        """
+        self.predicates = predicates
+        self.index_params = index_params
+        self.text_lookups = text_lookups or []
 
-        logger.debug(f"Filtering complete. Total maps after filtering: {len(filtered_maps)}", extra={"char": self.api.char.name})
-        return filtered_maps
+    def run(self, records: list, index=None) -> list:
+        """
+        Filter records, keeping their order.
 
-    def get_map(self, params):
-        logger.debug(f"Getting map with params: {params}", extra={"char": self.api.char.name})
-        
-        if not self.all_maps:
-            logger.debug("Cache is empty, calling _cache_maps() to load maps.", extra={"char": self.api.char.name})
-            self._cache_maps()
+        Args:
+            records (list): The collection to filter.
+            index: Secondary index of the collection, consulted for index_params.
 
-        if "x" in params and "y" in params:
-            map_key = f"{params['x']}/{params['y']}"
-            map_item = self.cache.get(map_key)
+        Returns:
+            list: The records matching every condition.
+        """
+        candidates = None
+        if self.index_params and index is not None:
+            candidates = index.candidates(self.index_params)
+        for text_index, query in self.text_lookups:
+            matches = text_index.search(query)
+            candidates = matches if candidates is None else candidates & matches
+        if candidates is not None:
+            records = [records[position] for position in sorted(candidates)]
+
+        checks = [predicate for _, _, predicate in self.predicates]
+        if not checks:
+            return list(records)
+        if len(checks) == 1:
+            check = checks[0]
+            return [record for record in records if check(record)]
+        return [record for record in records if all(check(record) for check in checks)]
+
+
+class QueryEngine:
+    """
+    Compiles filter parameters into reusable queries over one collection.
+
+    Keys prefixed with "~" are OR conditions: a record matches a group if its field equals any of the
+    values given for that key. All the other supported keys must match. Compiled queries are cached
+    per set of parameters, and their predicate order comes from sampling the collection. Literal
+    searches on regex fields are answered by a TextIndex, taken from the ones built when the
+    collection loaded or otherwise built on first use; true patterns are still matched with the regex.
+    """
+    SAMPLE_SIZE = 64
+    PLAN_CACHE_SIZE = 128
+
+    def __init__(self, records: list, fields: Dict[str, QueryField], index=None, text_indexes: Optional[Dict[str, TextIndex]] = None):
+        """
+        Args:
+            records (list): The collection the queries run over.
+            fields (dict): Supported filter keys and how they are matched.
+            index: Optional secondary index with `KEYS` and `candidates(params)`, like ItemIndex.
+            text_indexes (dict): Prebuilt TextIndex per regex field, see StaticDataStore.query_engine.
+        """
+        self.records = records
+        self.fields = fields
+        self.index = index
+        self.plans: Dict[frozenset, Query] = {}
+        self.text_indexes: Dict[str, TextIndex] = dict(text_indexes or {})
+        self.lock = Lock()
+        self.compiled = 0
+        self.hits = 0
+
+        step = max(1, len(records) // self.SAMPLE_SIZE)
+        self.sample = records[::step][:self.SAMPLE_SIZE]
+
+    def compile(self, params: dict) -> Query:
+        """
+        Compile filter parameters into a query, or reuse the one compiled for the same parameters.
+
+        Args:
+            params (dict): Filter parameters.
+
+        Returns:
+            Query: The compiled query.
+        """
+        try:
+            key = frozenset(params.items())
+        except TypeError:
+            key = None
+
+        if key is not None:
+            with self.lock:
+                plan = self.plans.get(key)
+                if plan is not None:
+                    self.hits += 1
+                    return plan
+
+        plan = self._plan(params)
+        with self.lock:
+            self.compiled += 1
+            if key is not None:
+                if len(self.plans) >= self.PLAN_CACHE_SIZE:
+                    self.plans.pop(next(iter(self.plans)))
+                self.plans[key] = plan
+        return plan
+
+    def _plan(self, params: dict) -> Query:
+        index_keys = getattr(self.index, "KEYS", ())
+        index_params = {}
+        text_lookups = []
+        predicates = []
+        or_conditions: Dict[str, list] = {}
+
+        for key, value in params.items():
+            if key.startswith("~"):
+                or_conditions.setdefault(key[1:], []).append(value)
+            elif key in index_keys:
+                index_params[key] = value
+            elif key in self.fields and self.fields[key].kind == "regex" and TextIndex.is_plain(value):
+                text_lookups.append((self._text_index(key), value))
+            elif key in self.fields:
+                field = self.fields[key]
+                predicates.append((field.cost, field.predicate(value)))
+
+        for key, values in or_conditions.items():
+            predicates.append((QueryField.COSTS["eq"], lambda record, key=key, values=values: record.get(key) in values))
+
+        ordered = []
+        for cost, predicate in predicates:
+            selectivity = sum(1 for record in self.sample if predicate(record)) / len(self.sample) if self.sample else 1.0
+            ordered.append((selectivity, cost, predicate))
+        ordered.sort(key=lambda entry: (entry[0], entry[1]))
+        return Query(ordered, index_params or None, text_lookups)
+
+    def _text_index(self, key: str) -> TextIndex:
+        with self.lock:
+            text_index = self.text_indexes.get(key)
+        if text_index is None:
+            text_index = TextIndex(self.records, self.fields[key].getter)
+            with self.lock:
+                text_index = self.text_indexes.setdefault(key, text_index)
+        return text_index
+
+    def filter(self, params: dict) -> list:
+        """Compile (or reuse) the query for the given parameters and run it over the collection."""
+        return self.compile(params).run(self.records, self.index)
+
+    def stats(self) -> dict:
+        """Get the number of compiled queries and of plan cache hits."""
+        with self.lock:
+            return {"compiled": self.compiled, "hits": self.hits, "cached_plans": len(self.plans)}
+
+
+class ItemIndex:
+    """
+    Secondary indexes over the item catalog, used to answer filters without scanning every item.
+
+    Items are referred to by their position in the catalog, so intersecting candidate sets and
+    sorting the result restores the catalog order.
+    """
+    # Filter parameters answered by candidates()
+    KEYS = ('item_type', 'craft_skill', 'craft_material', 'min_level', 'max_level')
+
+    def __init__(self, items: list):
+        """
+        Args:
+            items (list): The cached item catalog.
+        """
+        self.items = items
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_craft_skill: Dict[str, List[int]] = {}
+        self.by_craft_material: Dict[str, List[int]] = {}
+
+        for position, item in enumerate(items):
+            self.by_type.setdefault(item.get('type'), []).append(position)
+            craft = item.get('craft')
+            if craft:
+                self.by_craft_skill.setdefault(craft.get('skill'), []).append(position)
+                for material in set(material['code'] for material in craft.get('items', [])):
+                    self.by_craft_material.setdefault(material, []).append(position)
+
+        by_level = sorted(range(len(items)), key=lambda position: items[position]['level'])
+        self.level_positions: List[int] = by_level
+        self.levels: List[int] = [items[position]['level'] for position in by_level]
+
+    def level_range(self, min_level: Optional[int] = None, max_level: Optional[int] = None) -> set:
+        """Get the positions of the items whose level lies within the given bounds (inclusive)."""
+        start = 0 if min_level is None else bisect_left(self.levels, min_level)
+        end = len(self.levels) if max_level is None else bisect_right(self.levels, max_level)
+        return set(self.level_positions[start:end])
+
+    def candidates(self, params: dict) -> Optional[set]:
+        """
+        Intersect the indexes matching the AND conditions of a filter.
+
+        Args:
+            params (dict): Filter parameters, as accepted by Items.get_item.
+
+        Returns:
+            Optional[set]: Positions of the candidate items, or None if no indexed condition is present.
+        """
+        sets = []
+        if 'item_type' in params:
+            sets.append(set(self.by_type.get(params['item_type'], ())))
+        if 'craft_skill' in params:
+            sets.append(set(self.by_craft_skill.get(params['craft_skill'], ())))
+        if 'craft_material' in params:
+            sets.append(set(self.by_craft_material.get(params['craft_material'], ())))
+        if 'min_level' in params or 'max_level' in params:
+            sets.append(self.level_range(params.get('min_level'), params.get('max_level')))
+        if not sets:
+            return None
+
+        sets.sort(key=len)
+        result = sets[0]
+        for other in sets[1:]:
+            result = result & other
+        return result
+
+
+class RecipeGraph:
+    """
+    The crafting recipes of the item catalog as a graph from each item to its materials.
+
+    Material trees and raw-material bills are memoized per item and quantity, skill requirements
+    per item. The per-quantity memos keep at most MEMO_SIZE entries each, dropping the oldest, and
+    everything is dropped with the graph when the catalog is reloaded.
+    """
+    MEMO_SIZE = 1024
+
+    def __init__(self, items: list):
+        """
+        Args:
+            items (list): The cached item catalog.
+        """
+        self.recipes: Dict[str, dict] = {}
+        self.used_in: Dict[str, List[str]] = {}
+        for item in items:
+            craft = item.get('craft')
+            if not craft or not craft.get('items'):
+                continue
+            self.recipes[item['code']] = {
+                "skill": craft.get('skill'),
+                "level": craft.get('level') or 0,
+                "yield": craft.get('quantity') or 1,
+                "materials": [(material['code'], material['quantity']) for material in craft['items']],
+            }
+            for material in craft['items']:
+                self.used_in.setdefault(material['code'], []).append(item['code'])
+
+        self.lock = Lock()
+        self.trees: Dict[Tuple[str, int], dict] = {}
+        self.bills: Dict[Tuple[str, int], Dict[str, int]] = {}
+        self.skills: Dict[str, Dict[str, int]] = {}
+
+    def is_craftable(self, code: str) -> bool:
+        """Check if an item has a recipe."""
+        return code in self.recipes
+
+    def tree(self, code: str, quantity: int = 1) -> dict:
+        """
+        Expand an item into its full material tree.
+
+        Args:
+            code (str): The item to craft.
+            quantity (int): How many units are needed.
+
+        Returns:
+            dict: {"code", "quantity", "crafts", "skill", "level", "materials"}, where "crafts" is the number
+            of craft actions (0 for raw materials) and "materials" holds the subtrees of the recipe.
+            The tree is a copy the caller may modify.
+
+        Raises:
+            APIException.RecipeCycle: If the recipes of the item depend on the item itself.
+        """
+        return self._copy(self._shared_tree(code, quantity))
+
+    @classmethod
+    def _copy(cls, node: dict) -> dict:
+        return {**node, "materials": [cls._copy(material) for material in node["materials"]]}
+
+    def _shared_tree(self, code: str, quantity: int) -> dict:
+        """The memoized tree, shared with other callers; only read it."""
+        with self.lock:
+            return self._tree(code, quantity, ())
+
+    def _remember(self, memo: dict, key, value) -> None:
+        if len(memo) >= self.MEMO_SIZE:
+            memo.pop(next(iter(memo)))
+        memo[key] = value
+
+    def _tree(self, code: str, quantity: int, path: tuple) -> dict:
+        node = self.trees.get((code, quantity))
+        if node is not None:
+            return node
+        if code in path:
+            raise APIException.RecipeCycle(" -> ".join(path + (code,)))
+
+        recipe = self.recipes.get(code)
+        if recipe is None:
+            node = {"code": code, "quantity": quantity, "crafts": 0, "skill": None, "level": 0, "materials": []}
+        else:
+            crafts = -(-quantity // recipe["yield"])
+            node = {
+                "code": code,
+                "quantity": quantity,
+                "crafts": crafts,
+                "skill": recipe["skill"],
+                "level": recipe["level"],
+                "materials": [self._tree(material, amount * crafts, path + (code,)) for material, amount in recipe["materials"]],
+            }
+        self._remember(self.trees, (code, quantity), node)
+        return node
+
+    def raw_materials(self, code: str, quantity: int = 1) -> Dict[str, int]:
+        """
+        Get the raw materials (items without a recipe) needed to craft an item from scratch.
+
+        Args:
+            code (str): The item to craft.
+            quantity (int): How many units are needed.
+
+        Returns:
+            dict: Raw material code -> quantity.
+        """
+        key = (code, quantity)
+        bill = self.bills.get(key)
+        if bill is None:
+            bill = {}
+            stack = [self._shared_tree(code, quantity)]
+            while stack:
+                node = stack.pop()
+                if node["materials"]:
+                    stack.extend(node["materials"])
+                else:
+                    bill[node["code"]] = bill.get(node["code"], 0) + node["quantity"]
+            with self.lock:
+                self._remember(self.bills, key, bill)
+        return dict(bill)
+
+    def required_skills(self, code: str) -> Dict[str, int]:
+        """
+        Get the skill levels needed to craft an item and every intermediate of its tree.
+
+        Returns:
+            dict: Skill -> minimum level.
+        """
+        skills = self.skills.get(code)
+        if skills is None:
+            skills = {}
+            stack = [self._shared_tree(code, 1)]
+            while stack:
+                node = stack.pop()
+                if node["skill"]:
+                    skills[node["skill"]] = max(skills.get(node["skill"], 0), node["level"])
+                stack.extend(node["materials"])
+            with self.lock:
+                self.skills[code] = skills
+        return dict(skills)
+
+    def resolve(self, code: str, quantity: int = 1, available: Optional[Dict[str, int]] = None) -> dict:
+        """
+        Work out how to craft an item from the materials at hand.
+
+        Available units of intermediates are used before crafting them, and the surplus of a craft
+        yielding several units is kept for later steps. The requested item itself is always crafted.
+
+        Args:
+            code (str): The item to craft.
+            quantity (int): How many units to craft.
+            available (dict): Item code -> quantity at hand, e.g. inventory and bank combined.
+
+        Returns:
+            dict: {
+                "crafts": [(item code, craft actions)] in an order they can be performed in,
+                "consumed": item code -> quantity taken from the available materials,
+                "missing": raw material code -> quantity still to obtain,
+                "skills": skill -> minimum level needed for the crafts,
+            }
+        """
+        self._shared_tree(code, 1)  # Raises on cyclic recipes before we recurse without a path; cycles do not depend on the quantity
+        stock = dict(available or {})
+        crafts: Dict[str, int] = {}
+        consumed: Dict[str, int] = {}
+        missing: Dict[str, int] = {}
+        skills: Dict[str, int] = {}
+
+        def need(item_code: str, amount: int, use_stock: bool = True):
+            if use_stock:
+                taken = min(stock.get(item_code, 0), amount)
+                if taken:
+                    stock[item_code] -= taken
+                    consumed[item_code] = consumed.get(item_code, 0) + taken
+                    amount -= taken
+            if amount <= 0:
+                return
+            recipe = self.recipes.get(item_code)
+            if recipe is None:
+                missing[item_code] = missing.get(item_code, 0) + amount
+                return
+            count = -(-amount // recipe["yield"])
+            for material, material_amount in recipe["materials"]:
+                need(material, material_amount * count)
+            crafts[item_code] = crafts.get(item_code, 0) + count
+            stock[item_code] = stock.get(item_code, 0) + count * recipe["yield"] - amount
+            if recipe["skill"]:
+                skills[recipe["skill"]] = max(skills.get(recipe["skill"], 0), recipe["level"])
+
+        need(code, quantity, use_stock=False)
+        return {"crafts": list(crafts.items()), "consumed": consumed, "missing": missing, "skills": skills}
+
+    def max_craftable(self, code: str, available: Dict[str, int], skills: Optional[Dict[str, int]] = None) -> int:
+        """
+        Get how many units of an item can be crafted from the available materials alone.
+
+        Args:
+            code (str): The item to craft.
+            available (dict): Item code -> quantity at hand.
+            skills (dict): Skill -> level of the crafter. Skill requirements are ignored if omitted.
+
+        Returns:
+            int: The largest craftable quantity.
+        """
+        def feasible(quantity: int) -> bool:
+            plan = self.resolve(code, quantity, available)
+            if plan["missing"]:
+                return False
+            return skills is None or all(skills.get(skill, 0) >= level for skill, level in plan["skills"].items())
+
+        if code not in self.recipes or not feasible(1):
+            return 0
+        low, high = 1, 2
+        while feasible(high):
+            low, high = high, high * 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if feasible(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def craftable(self, available: Dict[str, int], skills: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Find every item that can be crafted from the available materials, including through intermediates.
+
+        Only items whose recipe tree uses one of the available materials are considered.
+
+        Args:
+            available (dict): Item code -> quantity at hand.
+            skills (dict): Skill -> level of the crafter. Skill requirements are ignored if omitted.
+
+        Returns:
+            dict: Item code -> largest craftable quantity, for the items that can be crafted at least once.
+        """
+        candidates = set()
+        stack = [code for code, quantity in available.items() if quantity > 0]
+        while stack:
+            for product in self.used_in.get(stack.pop(), ()):
+                if product not in candidates:
+                    candidates.add(product)
+                    stack.append(product)
+
+        result = {}
+        for code in candidates:
+            try:
+                quantity = self.max_craftable(code, available, skills)
+            except APIException.RecipeCycle:
+                continue
+            if quantity:
+                result[code] = quantity
+        return result
+
+
+class DropSourceIndex:
+    """
+    Inverted index from an item code to the monsters and resources dropping it, with their map tiles.
+    """
+    def __init__(self, monsters: list, resources: list, maps: list):
+        """
+        Args:
+            monsters (list): The cached monsters.
+            resources (list): The cached resources.
+            maps (list): The cached map tiles.
+        """
+        tiles: Dict[str, List[Position]] = {}
+        for map_item in maps:
+            content_code = _content_field(map_item, 'code')
+            if content_code:
+                tiles.setdefault(content_code, []).append(Position(map_item['x'], map_item['y']))
+
+        self.sources: Dict[str, List[DropSource]] = {}
+        # (source type, source code) -> expected items dropped per attempt, all drops included
+        self.yields: Dict[Tuple[str, str], float] = {}
+        for source_type, records in (("monster", monsters), ("resource", resources)):
+            for record in records:
+                self.yields[(source_type, record['code'])] = sum(
+                    (drop.get('min_quantity', 1) + drop.get('max_quantity', 1)) / 2 / (drop.get('rate', 1) or 1)
+                    for drop in record.get('drops', []))
+                for drop in record.get('drops', []):
+                    self.sources.setdefault(drop['code'], []).append(DropSource(
+                        type=source_type,
+                        code=record['code'],
+                        name=record.get('name', record['code']),
+                        level=record.get('level', 0),
+                        skill=record.get('skill') or "combat",
+                        rate=drop.get('rate', 1),
+                        min_quantity=drop.get('min_quantity', 1),
+                        max_quantity=drop.get('max_quantity', 1),
+                        tiles=tiles.get(record['code'], []),
+                    ))
+
+        # Most reliable sources first: a rate of N means one drop every N attempts on average
+        for sources in self.sources.values():
+            sources.sort(key=lambda source: (source.rate, source.level))
+
+    def get(self, item_code: str) -> List[DropSource]:
+        """Get the sources of an item, most reliable first, or an empty list if nothing drops it."""
+        return self.sources.get(item_code, [])
+
+    def expected_drops(self, source: DropSource) -> float:
+        """Get the expected number of items, of any kind, one attempt at a source drops."""
+        return self.yields.get((source.type, source.code), 0.0)
+
+
+class MapSpatialIndex:
+    """
+    A grid over the map tiles, bucketed by content code and content type.
+
+    Each bucket maps grid cells of CELL_SIZE x CELL_SIZE tiles to the tiles they contain, so nearest
+    neighbour searches only visit the rings of cells around the starting position until no closer
+    tile can remain.
+    """
+    CELL_SIZE = 4
+
+    def __init__(self, maps: list, cell_size: int = CELL_SIZE):
+        """
+        Args:
+            maps (list): The cached map tiles.
+            cell_size (int): Width and height of a grid cell, in tiles.
+        """
+        self.cell_size = cell_size
+        self.buckets: Dict[Tuple[str, str], Dict[Tuple[int, int], list]] = {}
+        self.bounds: Dict[Tuple[str, str], Tuple[int, int, int, int]] = {}
+
+        for map_item in maps:
+            cell = (map_item['x'] // cell_size, map_item['y'] // cell_size)
+            for kind in ('code', 'type'):
+                value = _content_field(map_item, kind)
+                if not value:
+                    continue
+                key = (kind, value)
+                self.buckets.setdefault(key, {}).setdefault(cell, []).append(map_item)
+                min_x, min_y, max_x, max_y = self.bounds.get(key, (cell[0], cell[1], cell[0], cell[1]))
+                self.bounds[key] = (min(min_x, cell[0]), min(min_y, cell[1]), max(max_x, cell[0]), max(max_y, cell[1]))
+
+    def nearest(self, position, k: int = 1, content_code: Optional[str] = None, content_type: Optional[str] = None) -> List[Tuple[int, dict]]:
+        """
+        Find the tiles with the given content closest to a position, by Manhattan distance.
+
+        Args:
+            position: A Position or (x, y) pair.
+            k (int): Maximum number of tiles to return.
+            content_code (str): Content code the tiles must hold.
+            content_type (str): Content type the tiles must hold.
+
+        Returns:
+            List[Tuple[int, dict]]: (distance, map tile) pairs, closest first.
+        """
+        key = ('code', content_code) if content_code else ('type', content_type)
+        bucket = self.buckets.get(key)
+        if not bucket or k <= 0:
+            return []
+
+        x, y = position
+        cell_x, cell_y = x // self.cell_size, y // self.cell_size
+        min_x, min_y, max_x, max_y = self.bounds[key]
+        max_ring = max(cell_x - min_x, max_x - cell_x, cell_y - min_y, max_y - cell_y)
+
+        found: List[Tuple[int, int, dict]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring(cell_x, cell_y, ring):
+                for map_item in bucket.get(cell, ()):
+                    if content_code and content_type and _content_field(map_item, 'type') != content_type:
+                        continue
+                    distance = abs(map_item['x'] - x) + abs(map_item['y'] - y)
+                    found.append((distance, len(found), map_item))
+            # Tiles in the next ring are at least this far away along one axis
+            if len(found) >= k and heapq.nsmallest(k, found)[-1][0] <= ring * self.cell_size + 1:
+                break
+
+        return [(distance, map_item) for distance, _, map_item in heapq.nsmallest(k, found)]
+
+    @staticmethod
+    def _ring(cell_x: int, cell_y: int, ring: int):
+        if ring == 0:
+            yield (cell_x, cell_y)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cell_x + dx, cell_y - ring)
+            yield (cell_x + dx, cell_y + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cell_x - ring, cell_y + dy)
+            yield (cell_x + ring, cell_y + dy)
+
+
+class RoutePlanner:
+    """
+    Orders multi-stop errands to minimise the total move cooldown.
+
+    Stops are positions or map contents (codes or types). A content stop can be served by any of its
+    nearest tiles, and the planner picks both the visiting order and the tile. Orderings of up to
+    EXACT_LIMIT stops are solved exactly with Held-Karp dynamic programming; longer errands use a
+    nearest-neighbour tour improved by 2-opt.
+    """
+    SECONDS_PER_TILE = 5
+    EXACT_LIMIT = 8
+    CANDIDATE_TILES = 3
+
+    def __init__(self, spatial: Optional[MapSpatialIndex] = None, seconds_per_tile: float = SECONDS_PER_TILE,
+                 exact_limit: int = EXACT_LIMIT, candidate_tiles: int = CANDIDATE_TILES):
+        """
+        Args:
+            spatial (MapSpatialIndex): Index used to find the tiles of content stops.
+            seconds_per_tile (float): Move cooldown per tile travelled.
+            exact_limit (int): Largest number of stops ordered exactly.
+            candidate_tiles (int): Number of nearest tiles considered for each content stop.
+        """
+        self.spatial = spatial
+        self.seconds_per_tile = seconds_per_tile
+        self.exact_limit = exact_limit
+        self.candidate_tiles = candidate_tiles
+
+    def _tiles(self, stop, start: Position) -> List[Tuple[Position, Optional[dict]]]:
+        if not isinstance(stop, str):
+            x, y = stop
+            return [(Position(x, y), None)]
+        if self.spatial is None:
+            raise ValueError(f"Cannot locate '{stop}' without a map index")
+        nearest = self.spatial.nearest(start, self.candidate_tiles, content_code=stop)
+        if not nearest:
+            nearest = self.spatial.nearest(start, self.candidate_tiles, content_type=stop)
+        if not nearest:
+            raise APIException.MapItemNotFound(f"No map tile holds '{stop}'")
+        return [(Position(tile['x'], tile['y']), tile) for _, tile in nearest]
+
+    def plan(self, stops: list, start, end=None) -> Route:
+        """
+        Plan the order in which to visit stops.
+
+        Args:
+            stops (list): Positions, (x, y) pairs or content codes/types to visit, in any order.
+            start: Position or (x, y) pair the route starts from.
+            end (optional): Stop the route must finish at, e.g. "bank".
+
+        Returns:
+            Route: The stops in visiting order (followed by the end stop, if any) with the total distance and cooldown.
+        """
+        start = Position(*start)
+        candidates = [self._tiles(stop, start) for stop in stops]
+        end_tiles = self._tiles(end, start) if end is not None else None
+
+        # Every candidate tile is a node; the travel-cost matrix covers the start and all of them
+        nodes = [(index, position, tile) for index, tiles in enumerate(candidates) for position, tile in tiles]
+        from_start = [start.dist(position) for _, position, _ in nodes]
+        matrix = [[a.dist(b) for _, b, _ in nodes] for _, a, _ in nodes]
+        to_end = [min(position.dist(tile) for tile, _ in end_tiles) if end_tiles else 0 for _, position, _ in nodes]
+
+        if not stops:
+            order = []
+        elif len(stops) <= self.exact_limit:
+            order = self._held_karp(len(stops), nodes, from_start, matrix, to_end)
+        else:
+            order = self._two_opt(self._nearest_neighbour(len(stops), nodes, from_start, matrix), from_start, matrix, to_end)
+
+        route = [RouteStop(name=str(stops[nodes[node][0]]), pos=nodes[node][1], content=nodes[node][2]) for node in order]
+        last = route[-1].pos if route else start
+        if end_tiles:
+            position, tile = min(end_tiles, key=lambda candidate: last.dist(candidate[0]))
+            route.append(RouteStop(name=str(end), pos=position, content=tile))
+
+        distance = 0
+        previous = start
+        for stop in route:
+            distance += previous.dist(stop.pos)
+            previous = stop.pos
+        return Route(stops=route, distance=distance, cooldown=distance * self.seconds_per_tile)
+
+    @staticmethod
+    def _held_karp(count: int, nodes: list, from_start: List[int], matrix: List[List[int]], to_end: List[int]) -> List[int]:
+        # best[(visited stops mask, last node)] = (distance, previous node)
+        best: Dict[Tuple[int, int], Tuple[int, Optional[int]]] = {}
+        for node, (stop, _, _) in enumerate(nodes):
+            key = (1 << stop, node)
+            if key not in best or from_start[node] < best[key][0]:
+                best[key] = (from_start[node], None)
+
+        for mask in range(1, 1 << count):
+            for node, (stop, _, _) in enumerate(nodes):
+                entry = best.get((mask, node))
+                if entry is None:
+                    continue
+                for following, (next_stop, _, _) in enumerate(nodes):
+                    if mask & (1 << next_stop):
+                        continue
+                    key = (mask | (1 << next_stop), following)
+                    distance = entry[0] + matrix[node][following]
+                    if key not in best or distance < best[key][0]:
+                        best[key] = (distance, node)
+
+        full = (1 << count) - 1
+        last = min((node for node in range(len(nodes)) if (full, node) in best), key=lambda node: best[(full, node)][0] + to_end[node])
+        order = []
+        mask, node = full, last
+        while node is not None:
+            order.append(node)
+            previous = best[(mask, node)][1]
+            mask &= ~(1 << nodes[node][0])
+            node = previous
+        return order[::-1]
+
+    @staticmethod
+    def _nearest_neighbour(count: int, nodes: list, from_start: List[int], matrix: List[List[int]]) -> List[int]:
+        visited = set()
+        order = []
+        distances = from_start
+        while len(order) < count:
+            node = min((node for node in range(len(nodes)) if nodes[node][0] not in visited), key=lambda node: distances[node])
+            order.append(node)
+            visited.add(nodes[node][0])
+            distances = matrix[node]
+        return order
+
+    @staticmethod
+    def _two_opt(order: List[int], from_start: List[int], matrix: List[List[int]], to_end: List[int]) -> List[int]:
+        def length(tour: List[int]) -> int:
+            total = from_start[tour[0]] + to_end[tour[-1]]
+            for a, b in zip(tour, tour[1:]):
+                total += matrix[a][b]
+            return total
+
+        best_length = length(order)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for j in range(i + 1, len(order)):
+                    candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                    candidate_length = length(candidate)
+                    if candidate_length < best_length:
+                        order, best_length, improved = candidate, candidate_length, True
+        return order
+
+
+ELEMENTS = ("fire", "earth", "water", "air")
+
+
+class ItemColumns:
+    """
+    Columnar NumPy view of the item catalog for vectorized filtering and ranking.
+
+    Rows follow the catalog order. `effects` is an (items x stats) matrix holding the value of each
+    effect code, 0 where an item does not have it.
+    """
+    def __init__(self, items: list):
+        """
+        Args:
+            items (list): The cached item catalog.
+        """
+        if np is None:
+            raise ImportError("ItemColumns requires numpy. Install it with: pip install artifactsmmo-wrapper[numpy]")
+        self.items = items
+        self.codes = [item['code'] for item in items]
+        self.level = np.array([item.get('level', 0) for item in items], dtype=np.int32)
+
+        self.types: List[str] = sorted({item.get('type') or '' for item in items})
+        type_codes = {item_type: code for code, item_type in enumerate(self.types)}
+        self.type_code = np.array([type_codes[item.get('type') or ''] for item in items], dtype=np.int32)
+
+        self.stats: List[str] = sorted({effect.get('code') or effect.get('name') for item in items for effect in item.get('effects') or []})
+        self.stat_index = {stat: column for column, stat in enumerate(self.stats)}
+        self.effects = np.zeros((len(items), len(self.stats)), dtype=np.float64)
+        for row, item in enumerate(items):
+            for effect in item.get('effects') or []:
+                self.effects[row, self.stat_index[effect.get('code') or effect.get('name')]] = effect.get('value', 0)
+
+    def column(self, stat: str) -> "np.ndarray":
+        """Get the values of one effect for every item (zeros if no item has it)."""
+        column = self.stat_index.get(stat)
+        return self.effects[:, column] if column is not None else np.zeros(len(self.items))
+
+    def mask(self, item_type: Optional[str] = None, min_level: Optional[int] = None, max_level: Optional[int] = None) -> "np.ndarray":
+        """Get a boolean mask of the items matching the given type and level bounds."""
+        mask = np.ones(len(self.items), dtype=bool)
+        if item_type is not None:
+            if item_type not in self.types:
+                return np.zeros(len(self.items), dtype=bool)
+            mask &= self.type_code == self.types.index(item_type)
+        if min_level is not None:
+            mask &= self.level >= min_level
+        if max_level is not None:
+            mask &= self.level <= max_level
+        return mask
+
+    def score(self, weights: Dict[str, float]) -> "np.ndarray":
+        """Score every item as the weighted sum of its effects, e.g. {"attack_earth": 1, "dmg_earth": 0.5}."""
+        vector = np.zeros(len(self.stats))
+        for stat, weight in weights.items():
+            if stat in self.stat_index:
+                vector[self.stat_index[stat]] = weight
+        return self.effects @ vector
+
+    def rank(self, weights: Dict[str, float], k: int = 10, mask: Optional["np.ndarray"] = None) -> List[Tuple[dict, float]]:
+        """
+        Get the best items for a weighted combination of effects.
+
+        Args:
+            weights (dict): Effect code -> weight.
+            k (int): Maximum number of items to return.
+            mask (np.ndarray, optional): Boolean mask of the items to consider, see mask().
+
+        Returns:
+            List[Tuple[dict, float]]: (item, score) pairs, best first.
+        """
+        scores = self.score(weights)
+        return _top_k(self.items, scores, k, mask)
+
+
+class MonsterColumns:
+    """
+    Columnar NumPy view of the monsters for vectorized filtering and scoring.
+
+    `attack` and `res` are (monsters x 4) matrices ordered like ELEMENTS.
+    """
+    def __init__(self, monsters: list):
+        """
+        Args:
+            monsters (list): The cached monsters.
+        """
+        if np is None:
+            raise ImportError("MonsterColumns requires numpy. Install it with: pip install artifactsmmo-wrapper[numpy]")
+        self.monsters = monsters
+        self.codes = [monster['code'] for monster in monsters]
+        self.level = np.array([monster.get('level', 0) for monster in monsters], dtype=np.int32)
+        self.hp = np.array([monster.get('hp', 0) for monster in monsters], dtype=np.float64)
+        self.critical_strike = np.array([monster.get('critical_strike', 0) for monster in monsters], dtype=np.float64)
+        self.attack = np.array([[monster.get(f'attack_{element}', 0) for element in ELEMENTS] for monster in monsters], dtype=np.float64).reshape(-1, 4)
+        self.res = np.array([[monster.get(f'res_{element}', 0) for element in ELEMENTS] for monster in monsters], dtype=np.float64).reshape(-1, 4)
+
+    def mask(self, min_level: Optional[int] = None, max_level: Optional[int] = None) -> "np.ndarray":
+        """Get a boolean mask of the monsters within the given level bounds."""
+        mask = np.ones(len(self.monsters), dtype=bool)
+        if min_level is not None:
+            mask &= self.level >= min_level
+        if max_level is not None:
+            mask &= self.level <= max_level
+        return mask
+
+    def incoming_damage(self, resistances) -> "np.ndarray":
+        """
+        Get the damage each monster deals per hit after the given resistances.
+
+        Args:
+            resistances: Percent resistance per element, as a {element: value} dict or a sequence ordered like ELEMENTS.
+
+        Returns:
+            np.ndarray: Damage per hit for every monster.
+        """
+        if isinstance(resistances, dict):
+            resistances = [resistances.get(element, 0) for element in ELEMENTS]
+        return self.attack @ (1 - np.asarray(resistances, dtype=np.float64) / 100)
+
+    def rank(self, scores: "np.ndarray", k: int = 10, mask: Optional["np.ndarray"] = None, lowest: bool = False) -> List[Tuple[dict, float]]:
+        """
+        Get the monsters with the highest (or lowest) scores.
+
+        Args:
+            scores (np.ndarray): One score per monster, e.g. from incoming_damage().
+            k (int): Maximum number of monsters to return.
+            mask (np.ndarray, optional): Boolean mask of the monsters to consider.
+            lowest (bool): Rank the lowest scores first.
+
+        Returns:
+            List[Tuple[dict, float]]: (monster, score) pairs, best first.
+        """
+        ranked = _top_k(self.monsters, -scores if lowest else scores, k, mask)
+        return [(monster, -score if lowest else score) for monster, score in ranked]
+
+
+def _top_k(records: list, scores: "np.ndarray", k: int, mask: Optional["np.ndarray"] = None) -> List[Tuple[dict, float]]:
+    """Get the k records with the highest scores, best first, ties kept in catalog order."""
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(records))
+    if k <= 0 or not len(candidates):
+        return []
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [(records[row], float(scores[row])) for row in candidates]
+
+
+def _element_hit(attack, dmg, res):
+    """
+    Damage of a non-critical hit in one element, before rounding.
+
+    dmg is the attacker's damage bonus for the element, the global dmg bonus included. Works on
+    numbers and on NumPy arrays alike.
+    """
+    return attack * (1 + dmg / 100) * (1 - res / 100)
+
+
+class CombatSimulator:
+    """
+    Batched estimate of fight outcomes from the character and monster stats.
+
+    The character attacks first, then both sides alternate until one drops to 0 HP or MAX_TURNS
+    attacks were made in total, which counts as a loss. Each hit deals, per element,
+    attack * (1 + (dmg_element + dmg) / 100) * (1 - res / 100), rounded (see _element_hit). Critical strikes multiply a hit by
+    CRIT_MULTIPLIER and are either averaged in (the default) or sampled with Monte-Carlo.
+
+    Both sides are given as batches that broadcast against each other: one character against
+    every monster, or many gear variants against one monster.
+    """
+    MAX_TURNS = 100
+    CRIT_MULTIPLIER = 1.5
+
+    def __init__(self, max_turns: int = MAX_TURNS, crit_multiplier: float = CRIT_MULTIPLIER):
+        """
+        Args:
+            max_turns (int): Total attacks (both sides) after which the fight is lost.
+            crit_multiplier (float): Damage multiplier of critical strikes.
+        """
+        if np is None:
+            raise ImportError("CombatSimulator requires numpy. Install it with: pip install artifactsmmo-wrapper[numpy]")
+        self.max_turns = max_turns
+        self.crit_multiplier = crit_multiplier
+
+    @staticmethod
+    def player_stats(players) -> Dict[str, "np.ndarray"]:
+        """
+        Stack character stats into arrays.
+
+        Args:
+            players: A PlayerData, a dict with the same stat names, or a list of them (e.g. gear variants).
+
+        Returns:
+            dict: "attack", "dmg", "res" (players x 4, ordered like ELEMENTS), "hp" and "critical_strike" (players).
+            "dmg" is the damage bonus of each element plus the global dmg bonus.
+        """
+        if not isinstance(players, (list, tuple)):
+            players = [players]
+        read = lambda player, name: (player.get(name, 0) if isinstance(player, dict) else getattr(player, name, 0)) or 0
+        return {
+            "attack": np.array([[read(player, f"attack_{element}") for element in ELEMENTS] for player in players], dtype=np.float64),
+            "dmg": np.array([[read(player, f"dmg_{element}") + read(player, "dmg") for element in ELEMENTS] for player in players], dtype=np.float64),
+            "res": np.array([[read(player, f"res_{element}") for element in ELEMENTS] for player in players], dtype=np.float64),
+            "hp": np.array([read(player, "hp") for player in players], dtype=np.float64),
+            "critical_strike": np.array([read(player, "critical_strike") for player in players], dtype=np.float64),
+        }
+
+    def hits(self, player: Dict[str, "np.ndarray"], monsters: MonsterColumns) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Get the damage of a non-critical hit of the character and of the monster, for every pair in the batch."""
+        # An element resisted beyond 100% deals nothing rather than healing
+        player_hit = np.maximum(np.round(_element_hit(player["attack"], player["dmg"], monsters.res)), 0).sum(axis=-1)
+        monster_hit = np.maximum(np.round(_element_hit(monsters.attack, 0, player["res"])), 0).sum(axis=-1)
+        return player_hit, monster_hit
+
+    def simulate(self, player: Dict[str, "np.ndarray"], monsters: MonsterColumns, samples: int = 0, seed: Optional[int] = None) -> CombatOutcome:
+        """
+        Estimate the outcome of each fight in the batch.
+
+        Args:
+            player (dict): Character stats from player_stats(), one row or one row per fight.
+            monsters (MonsterColumns): Monster stats, one row or one row per fight.
+            samples (int): Number of Monte-Carlo fights sampled per pair. 0 averages critical strikes into the hits.
+            seed (int, optional): Seed of the crit sampling.
+
+        Returns:
+            CombatOutcome: Win rate, turns and HP lost per fight.
+        """
+        player_hit, monster_hit = self.hits(player, monsters)
+        player_hp = np.broadcast_to(player["hp"], player_hit.shape)
+        monster_hp = np.broadcast_to(monsters.hp, player_hit.shape)
+        player_crit = np.broadcast_to(player["critical_strike"], player_hit.shape) / 100
+        monster_crit = np.broadcast_to(monsters.critical_strike, player_hit.shape) / 100
+
+        if samples <= 0:
+            player_hit = player_hit * (1 + (self.crit_multiplier - 1) * player_crit)
+            monster_hit = monster_hit * (1 + (self.crit_multiplier - 1) * monster_crit)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                player_attacks = np.where(player_hit > 0, np.ceil(monster_hp / player_hit), np.inf)
+                monster_attacks = np.where(monster_hit > 0, np.ceil(player_hp / monster_hit), np.inf)
+            win = (player_attacks <= monster_attacks) & (2 * player_attacks - 1 <= self.max_turns)
+            turns = np.where(win, 2 * player_attacks - 1, np.minimum(2 * monster_attacks, self.max_turns))
+            hp_lost = np.where(win, monster_hit * (player_attacks - 1), player_hp)
+            return CombatOutcome(win_rate=win.astype(np.float64), turns=turns, hp_lost=np.minimum(hp_lost, player_hp))
+
+        rng = np.random.default_rng(seed)
+        player_turns = (self.max_turns + 1) // 2
+        monster_turns = self.max_turns // 2
+        shape = (samples,) + player_hit.shape
+        player_damage = player_hit[..., None] * np.where(rng.random(shape + (player_turns,)) < player_crit[..., None], self.crit_multiplier, 1)
+        monster_damage = monster_hit[..., None] * np.where(rng.random(shape + (monster_turns,)) < monster_crit[..., None], self.crit_multiplier, 1)
+        player_total = np.cumsum(player_damage, axis=-1)
+        monster_total = np.cumsum(monster_damage, axis=-1)
+
+        # Index of the attack that finishes the opponent, or the attack count if it never does
+        player_kills = player_total >= monster_hp[..., None]
+        monster_kills = monster_total >= player_hp[..., None]
+        player_kill = np.where(player_kills.any(axis=-1), player_kills.argmax(axis=-1), player_turns)
+        monster_kill = np.where(monster_kills.any(axis=-1), monster_kills.argmax(axis=-1), monster_turns)
+
+        win = (player_kill < player_turns) & (player_kill <= monster_kill)
+        taken = np.take_along_axis(np.concatenate([np.zeros(shape + (1,)), monster_total], axis=-1),
+                                   np.minimum(player_kill, monster_turns)[..., None], axis=-1)[..., 0]
+        turns = np.where(win, 2 * player_kill + 1, np.minimum(2 * monster_kill + 2, self.max_turns))
+        hp_lost = np.where(win, np.minimum(taken, player_hp), player_hp)
+        return CombatOutcome(win_rate=win.mean(axis=0), turns=turns.mean(axis=0), hp_lost=hp_lost.mean(axis=0))
+
+
+class LoadoutOptimizer:
+    """
+    Branch-and-bound search for the best combination of equipment.
+
+    The objective receives the total stats (base stats plus the effects of the chosen items) and must
+    not decrease when any stat grows, which makes "current stats plus the best value of every stat
+    over the remaining slots" an optimistic bound used to prune the search.
+
+    Objectives flagged `supermodular` (their gains from a stat never shrink when other stats grow, like
+    attack x damage bonus) get a tighter bound as well: the current score plus, for every remaining
+    slot, the best candidate under the objective's gradient at that optimistic point. An objective
+    that is not supermodular itself can provide a supermodular `relaxation` for that bound, with a
+    `relaxation_slack` giving, at a point, the most the objective can exceed the relaxation at or below it.
+    """
+    SLOT_TYPES = {
+        "weapon": "weapon", "shield": "shield", "helmet": "helmet", "body_armor": "body_armor",
+        "leg_armor": "leg_armor", "boots": "boots", "ring1": "ring", "ring2": "ring", "amulet": "amulet",
+        "artifact1": "artifact", "artifact2": "artifact", "artifact3": "artifact",
+        "utility1": "utility", "utility2": "utility",
+    }
+    # Utilities are stacks of consumables and are left out unless asked for
+    DEFAULT_SLOTS = tuple(slot for slot, item_type in SLOT_TYPES.items() if item_type != "utility")
+
+    def __init__(self, items: Dict[str, dict], objective):
+        """
+        Args:
+            items (dict): Item code -> item, e.g. Items.cache.
+            objective (callable): Scores a {stat: total value} dict, higher is better. If it has a `stats`
+                attribute, only those stats are considered.
+        """
+        self.items = items
+        self.objective = objective
+
+    @staticmethod
+    def effects(item: Optional[dict]) -> Dict[str, float]:
+        """Get the effects of an item as {effect code: value}."""
+        if not item:
+            return {}
+        return {effect.get('code') or effect.get('name'): effect.get('value', 0) for effect in item.get('effects') or []}
+
+    @staticmethod
+    def damage_objective(monster: dict, crit_multiplier: float = CombatSimulator.CRIT_MULTIPLIER):
+        """
+        Build an objective scoring the expected damage per hit against a monster.
+
+        Hits are computed like CombatSimulator.hits (rounded per element, see _element_hit) with
+        critical strikes averaged in. Rounding breaks supermodularity, so the objective carries the
+        unrounded hits as a supermodular relaxation, and the most rounding can add on top of it
+        (0.5 per element dealing damage) as its slack.
+
+        Args:
+            monster (dict): The monster to fight.
+            crit_multiplier (float): Damage multiplier of critical strikes.
+        """
+        elements = [(f'attack_{element}', f'dmg_{element}', monster.get(f'res_{element}', 0)) for element in ELEMENTS]
+        # Elements the monster fully resists never deal damage
+        elements = [entry for entry in elements if entry[2] < 100]
+
+        def crit_factor(stats: Dict[str, float]) -> float:
+            # Not capped at 100%, which keeps the relaxation supermodular; gear stays far below it
+            critical_strike = stats.get('critical_strike', 0)
+            return 1 + (crit_multiplier - 1) * critical_strike / 100 if critical_strike > 0 else 1
+
+        def hits(stats: Dict[str, float]) -> List[float]:
+            bonus = stats.get('dmg', 0)
+            hits = []
+            for attack_key, dmg_key, res in elements:
+                attack = stats.get(attack_key, 0)
+                if attack > 0:
+                    hit = _element_hit(attack, stats.get(dmg_key, 0) + bonus, res)
+                    if hit > 0:
+                        hits.append(hit)
+            return hits
+
+        def objective(stats: Dict[str, float]) -> float:
+            return sum(map(round, hits(stats))) * crit_factor(stats)
+
+        def relaxation(stats: Dict[str, float]) -> float:
+            return sum(hits(stats)) * crit_factor(stats)
+
+        def relaxation_slack(stats: Dict[str, float]) -> float:
+            return 0.5 * len(hits(stats)) * crit_factor(stats)
+
+        relaxation.supermodular = True
+        objective.relaxation = relaxation
+        objective.relaxation_slack = relaxation_slack
+        objective.stats = frozenset([key for attack_key, dmg_key, _ in elements for key in (attack_key, dmg_key)] + ['dmg', 'critical_strike'])
+        return objective
+
+    @staticmethod
+    def weighted_objective(weights: Dict[str, float]):
+        """
+        Build an objective scoring the weighted sum of the stats.
+
+        Args:
+            weights (dict): Stat -> weight.
+
+        Raises:
+            ValueError: If a weight is negative, as the search bounds assume more of a stat never scores less.
+        """
+        negative = {stat: weight for stat, weight in weights.items() if weight < 0}
+        if negative:
+            raise ValueError(f"Loadout weights must not be negative: {negative}")
+
+        def objective(stats: Dict[str, float]) -> float:
+            return sum(weight * stats.get(stat, 0) for stat, weight in weights.items())
+        objective.stats = frozenset(stat for stat, weight in weights.items() if weight)
+        objective.supermodular = True
+        return objective
+
+    def optimize(self, base: Dict[str, float], equipped: Dict[str, Optional[str]], inventory: Dict[str, int],
+                 bank: Optional[Dict[str, int]] = None, level: Optional[int] = None, slots: tuple = DEFAULT_SLOTS) -> Loadout:
+        """
+        Find the best loadout from the equipped items, the inventory and the bank.
+
+        Args:
+            base (dict): Character stats without any equipment.
+            equipped (dict): Slot -> currently equipped item code (None or "" if empty).
+            inventory (dict): Item code -> quantity in the inventory.
+            bank (dict, optional): Item code -> quantity in the bank.
+            level (int, optional): Character level; higher level items are skipped.
+            slots (tuple): Slots to optimize; the others keep their items.
+
+        Returns:
+            Loadout: The best loadout found (the current one on ties) and the actions to equip it.
+
+        Raises:
+            ValueError: If a slot is not one of SLOT_TYPES.
+        """
+        unknown = (set(equipped) | set(slots)) - set(self.SLOT_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown equipment slots: {sorted(unknown)}")
+        bank = bank or {}
+        equipped = {slot: code or None for slot, code in equipped.items()}
+        available: Dict[str, int] = {}
+        for source in (inventory, bank):
+            for code, quantity in source.items():
+                available[code] = available.get(code, 0) + quantity
+        for slot in slots:
+            if equipped.get(slot):
+                available[equipped[slot]] = available.get(equipped[slot], 0) + 1
+
+        # Stats of the items kept in the slots that are not optimized
+        fixed = dict(base)
+        for slot, code in equipped.items():
+            if slot not in slots and code:
+                for stat, value in self.effects(self.items.get(code)).items():
+                    fixed[stat] = fixed.get(stat, 0) + value
+
+        relevant = getattr(self.objective, "stats", None)
+        project = (lambda effects: {stat: value for stat, value in effects.items() if stat in relevant}) if relevant is not None else (lambda effects: effects)
+
+        groups: Dict[str, List[str]] = {}
+        for slot in slots:
+            groups.setdefault(self.SLOT_TYPES[slot], []).append(slot)
+        candidates = {item_type: self._candidates(item_type, len(group_slots), available, level, project)
+                      for item_type, group_slots in groups.items()}
+
+        # Only the stats some candidate changes are searched over; the others stay constant
+        stats = sorted({stat for options in candidates.values() for code in options if code
+                        for stat, value in project(self.effects(self.items[code])).items() if value})
+        constant = {stat: value for stat, value in (project(fixed) if relevant is not None else fixed).items() if stat not in stats}
+        vector = lambda effects: [effects.get(stat, 0) for stat in stats]
+        vectors = {code: vector(project(self.effects(self.items[code]))) for options in candidates.values() for code in options if code}
+        vectors[None] = [0] * len(stats)
+        add = lambda a, b: [x + y for x, y in zip(a, b)]
+
+        def evaluate(objective, totals: List[float]) -> float:
+            values = dict(constant)
+            values.update(zip(stats, totals))
+            return objective(values)
+
+        score = lambda totals: evaluate(self.objective, totals)
+        relaxation = getattr(self.objective, "relaxation", None)
+        if relaxation is None and getattr(self.objective, "supermodular", False):
+            relaxation = self.objective
+        relaxed = (lambda totals: evaluate(relaxation, totals)) if relaxation is not None else None
+        relaxation_slack = getattr(self.objective, "relaxation_slack", None)
+        slack = (lambda totals: evaluate(relaxation_slack, totals)) if relaxation_slack is not None else (lambda totals: 0.0)
+
+        start_totals = vector(fixed)
+
+        # Try the most promising candidates first, and the slot types with the largest impact first
+        start_score = score(start_totals)
+        gain = {code: score(add(start_totals, vectors[code])) - start_score for code in vectors}
+        for options in candidates.values():
+            options.sort(key=lambda code: gain[code], reverse=True)
+        order = [(item_type, index) for item_type in sorted(groups, key=lambda item_type: -max(gain[code] for code in candidates[item_type]))
+                 for index in range(len(groups[item_type]))]
+
+        # Optimistic totals the remaining slots can add: the best value of every stat, each from any candidate
+        remaining = [[0] * len(stats) for _ in range(len(order) + 1)]
+        for depth in range(len(order) - 1, -1, -1):
+            item_type = order[depth][0]
+            best_values = [max([0] + [vectors[code][column] for code in candidates[item_type]]) for column in range(len(stats))]
+            remaining[depth] = add(remaining[depth + 1], best_values)
+
+        current = dict(fixed)
+        for slot in slots:
+            for stat, value in self.effects(self.items.get(equipped.get(slot))).items():
+                current[stat] = current.get(stat, 0) + value
+        best = {"score": self.objective(current), "choice": None}
+        greedy_choice, greedy_score = self._greedy(order, candidates, vectors, available, start_totals, score)
+        if greedy_score > best["score"] + 1e-9:
+            best["score"], best["choice"] = greedy_score, greedy_choice
+
+        used: Dict[str, int] = {}
+        choice: List[Tuple[str, Optional[str]]] = []
+        positive = {item_type: [[max(0, value) for value in vectors[code]] for code in options] for item_type, options in candidates.items()}
+
+        def gradient_gains(depth: int, totals: List[float]) -> float:
+            # Optimistic gain of the slots after depth, using the gradient at the most optimistic point
+            point = add(totals, remaining[depth])
+            at_point = relaxed(point)
+            gradient = [0.0] * len(stats)
+            # Stats no later candidate raises do not contribute
+            for column in range(len(stats)):
+                if remaining[depth + 1][column] > 0:
+                    point[column] += 1
+                    gradient[column] = relaxed(point) - at_point
+                    point[column] -= 1
+            per_type: Dict[str, float] = {}
+            total = 0.0
+            for item_type, _ in order[depth + 1:]:
+                if item_type not in per_type:
+                    per_type[item_type] = max(sum(g * v for g, v in zip(gradient, values)) for values in positive[item_type])
+                total += per_type[item_type]
+            return total
+
+        def search(depth: int, totals: List[float], previous: int):
+            if depth == len(order):
+                value = score(totals)
+                if value > best["score"] + 1e-9:
+                    best["score"], best["choice"] = value, list(choice)
+                return
+            item_type, index = order[depth]
+            options = candidates[item_type]
+            rest = remaining[depth + 1]
+            gains = None
+            children = []
+            # Slots of one type are interchangeable: only visit non-decreasing candidate positions
+            for option in range(previous if index > 0 else 0, len(options)):
+                code = options[option]
+                if code is not None and used.get(code, 0) >= available.get(code, 0):
+                    continue
+                child = add(totals, vectors[code])
+                optimistic = add(child, rest)
+                bound = score(optimistic)
+                if relaxed is not None and depth + 1 < len(order) and bound > best["score"] + 1e-9:
+                    if gains is None:
+                        gains = gradient_gains(depth, totals)
+                    bound = min(bound, relaxed(child) + gains + slack(optimistic))
+                if bound > best["score"] + 1e-9:
+                    children.append((bound, option, code, child))
+            children.sort(key=lambda entry: entry[0], reverse=True)
+            for bound, option, code, child in children:
+                if bound <= best["score"] + 1e-9:
+                    break
+                if code is not None:
+                    used[code] = used.get(code, 0) + 1
+                choice.append((item_type, code))
+                search(depth + 1, child, option)
+                choice.pop()
+                if code is not None:
+                    used[code] -= 1
+
+        search(0, start_totals, 0)
+
+        target = {slot: equipped.get(slot) for slot in slots}
+        if best["choice"] is not None:
+            for item_type, group_slots in groups.items():
+                chosen = [code for chosen_type, code in best["choice"] if chosen_type == item_type]
+                target.update(self._assign(group_slots, chosen, equipped))
+        return Loadout(slots=target, score=best["score"], actions=self._actions(target, equipped, inventory))
+
+    def _candidates(self, item_type: str, slot_count: int, available: Dict[str, int], level: Optional[int], project) -> List[Optional[str]]:
+        codes = [code for code, quantity in available.items() if quantity > 0 and code in self.items
+                 and self.items[code].get('type') == item_type and (level is None or self.items[code].get('level', 0) <= level)]
+        effects = {code: project(self.effects(self.items[code])) for code in codes}
+        effects[None] = {}
+
+        def dominates(better: Optional[str], worse: Optional[str]) -> bool:
+            keys = set(effects[better]) | set(effects[worse])
+            return all(effects[better].get(key, 0) >= effects[worse].get(key, 0) for key in keys)
+
+        # An option can be dropped if another one is at least as good on every stat and can fill every slot of the type
+        options = codes + [None]
+        kept = []
+        for code in options:
+            if not any(other != code and (other is None or available[other] >= slot_count) and dominates(other, code)
+                       and not (dominates(code, other) and (code is None or repr(code) < repr(other))) for other in options):
+                kept.append(code)
+        return kept
+
+    @staticmethod
+    def _greedy(order: list, candidates: dict, vectors: dict, available: Dict[str, int], totals: List[float], score) -> Tuple[list, float]:
+        # Coordinate ascent from empty slots, giving the search a good first incumbent
+        choice: List[Optional[str]] = [None] * len(order)
+        used: Dict[str, int] = {}
+        best_score = score(totals)
+        for _ in range(5):
+            improved = False
+            for depth, (item_type, _) in enumerate(order):
+                removed = [a - b for a, b in zip(totals, vectors[choice[depth]])]
+                if choice[depth] is not None:
+                    used[choice[depth]] -= 1
+                best_code, best_value = choice[depth], score([a + b for a, b in zip(removed, vectors[choice[depth]])])
+                for code in candidates[item_type]:
+                    if code is not None and used.get(code, 0) >= available.get(code, 0):
+                        continue
+                    value = score([a + b for a, b in zip(removed, vectors[code])])
+                    if value > best_value + 1e-9:
+                        best_code, best_value = code, value
+                improved |= best_code != choice[depth]
+                choice[depth] = best_code
+                if best_code is not None:
+                    used[best_code] = used.get(best_code, 0) + 1
+                totals = [a + b for a, b in zip(removed, vectors[best_code])]
+                best_score = best_value
+            if not improved:
+                break
+        return [(item_type, code) for (item_type, _), code in zip(order, choice)], best_score
+
+    @staticmethod
+    def _assign(group_slots: List[str], chosen: List[Optional[str]], equipped: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        # Leave items where they already are, so swapping two rings costs nothing
+        remaining = list(chosen)
+        assignment = {}
+        for slot in group_slots:
+            if equipped.get(slot) in remaining:
+                assignment[slot] = equipped.get(slot)
+                remaining.remove(equipped.get(slot))
+        for slot in group_slots:
+            if slot not in assignment:
+                assignment[slot] = remaining.pop(0)
+        return assignment
+
+    @staticmethod
+    def _actions(target: Dict[str, Optional[str]], equipped: Dict[str, Optional[str]], inventory: Dict[str, int]) -> List[Tuple[str, dict]]:
+        changed = [slot for slot, code in target.items() if code != equipped.get(slot)]
+        unequipped: Dict[str, int] = {}
+        needed: Dict[str, int] = {}
+        for slot in changed:
+            if equipped.get(slot):
+                unequipped[equipped[slot]] = unequipped.get(equipped[slot], 0) + 1
+            if target[slot]:
+                needed[target[slot]] = needed.get(target[slot], 0) + 1
+
+        actions = []
+        for code, quantity in needed.items():
+            missing = quantity - inventory.get(code, 0) - unequipped.get(code, 0)
+            if missing > 0:
+                actions.append(("bank_withdraw_item", {"item_code": code, "quantity": missing}))
+        for slot in changed:
+            if equipped.get(slot):
+                actions.append(("unequip_item", {"slot": slot}))
+        for slot in changed:
+            if target[slot]:
+                actions.append(("equip_item", {"item_code": target[slot], "slot": slot}))
+        return actions
+
+
+PRODUCTION_SKILLS = ("mining", "woodcutting", "fishing", "weaponcrafting", "gearcrafting", "jewelrycrafting", "cooking", "alchemy")
+
+
+class ProductionPlanner:
+    """
+    Plans how to produce an item from the inventory, the bank, gathering, fights and crafts.
+
+    Production is split into batches whose materials fit in the inventory. For each batch the planner:
+    - withdraws the materials the bank already holds,
+    - collects the missing raw materials from the source with the lowest estimated cooldown, visiting
+      the sources in the order found by RoutePlanner,
+    - crafts the intermediates and the goal at their workshops,
+    - deposits the whole inventory before starting the next one.
+
+    Batches also leave room for the other items the chosen sources drop, in proportion to their drop rates.
+
+    Cooldowns are estimates: ACTION_SECONDS per action, SECONDS_PER_TILE per tile travelled.
+    """
+    ACTION_SECONDS = {"gather": 25, "fight": 25, "craft": 5, "bank": 3}
+
+    def __init__(self, recipes: RecipeGraph, sources: DropSourceIndex, spatial: MapSpatialIndex,
+                 action_seconds: Optional[Dict[str, float]] = None, seconds_per_tile: float = RoutePlanner.SECONDS_PER_TILE):
+        """
+        Args:
+            recipes (RecipeGraph): Recipes of the item catalog.
+            sources (DropSourceIndex): Monsters and resources dropping each item.
+            spatial (MapSpatialIndex): Map index used to locate the bank, workshops and sources.
+            action_seconds (dict, optional): Estimated cooldown per action, overriding ACTION_SECONDS.
+            seconds_per_tile (float): Move cooldown per tile travelled.
+        """
+        self.recipes = recipes
+        self.sources = sources
+        self.spatial = spatial
+        self.action_seconds = dict(self.ACTION_SECONDS, **(action_seconds or {}))
+        self.seconds_per_tile = seconds_per_tile
+
+    def plan(self, item_code: str, quantity: int, inventory: Dict[str, int], bank: Dict[str, int], position,
+             free_space: int, skills: Optional[Dict[str, int]] = None, level: Optional[int] = None) -> ProductionPlan:
+        """
+        Plan the production of an item.
+
+        Args:
+            item_code (str): The item to produce.
+            quantity (int): How many units to produce.
+            inventory (dict): Item code -> quantity in the inventory.
+            bank (dict): Item code -> quantity in the bank.
+            position: Position or (x, y) pair the character starts from.
+            free_space (int): Free inventory space, in items.
+            skills (dict, optional): Skill -> level, used to skip resources that cannot be gathered yet.
+            level (int, optional): Character level, used to skip monsters above it.
+
+        Returns:
+            ProductionPlan: The steps in order with their estimated cooldown.
+
+        Raises:
+            ValueError: If the materials of a single unit do not fit in the free inventory space.
+        """
+        inventory = {code: count for code, count in inventory.items() if count > 0}
+        bank = {code: count for code, count in bank.items() if count > 0}
+        capacity = free_space + sum(inventory.values())
+        position = Position(*position)
+        steps: List[PlanStep] = []
+        missing: Dict[str, int] = {}
+        unmet_skills: Dict[str, int] = {}
+        keep = set()
+        bank_position = self._locate("bank", position)
+        # Expected units of the other items the sources drop alongside the materials
+        byproducts = 0.0
+
+        def add(code: str, amount: int, holder: Dict[str, int]):
+            holder[code] = holder.get(code, 0) + amount
+            if holder[code] <= 0:
+                del holder[code]
+
+        def move(target: Position):
+            nonlocal position
+            if (target.x, target.y) != (position.x, position.y):
+                steps.append(PlanStep("move", target.x, target.y, seconds=position.dist(target) * self.seconds_per_tile))
+                position = target
+
+        def collect(materials: Dict[str, int]) -> list:
+            return [(code, count, self._best_source(code, count, position, skills, level)) for code, count in materials.items()]
+
+        def load(batch: int) -> int:
+            plan = self.recipes.resolve(item_code, batch, self._combined(inventory, bank))
+            withdrawn = sum(max(0, count - inventory.get(code, 0)) for code, count in plan["consumed"].items())
+            extra = sum(self._attempts(source, count) * self.sources.expected_drops(source) - count
+                        for code, count, source in collect(plan["missing"]) if source is not None)
+            return withdrawn + sum(plan["missing"].values()) + math.ceil(extra)
+
+        remaining = quantity
+        while remaining > 0:
+            free = capacity - sum(inventory.values()) - math.ceil(byproducts)
+            batch = self._batch_size(remaining, free, load)
+            if batch == 0:
+                raise ValueError(f"The materials for one {item_code} do not fit in the {free} free inventory slots")
+            plan = self.recipes.resolve(item_code, batch, self._combined(inventory, bank))
+            keep.update(plan["consumed"], plan["missing"], (code for code, _ in plan["crafts"]))
+            for skill, required in plan["skills"].items():
+                if skills is not None and skills.get(skill, 0) < required:
+                    unmet_skills[skill] = max(unmet_skills.get(skill, 0), required)
+
+            withdrawals = {code: count - inventory.get(code, 0) for code, count in plan["consumed"].items() if count > inventory.get(code, 0)}
+            if withdrawals:
+                move(bank_position)
+                for code, count in withdrawals.items():
+                    steps.append(PlanStep("withdraw", position.x, position.y, code, count, self.action_seconds["bank"]))
+                    add(code, -count, bank)
+                    add(code, count, inventory)
+
+            sources = []
+            for code, count, source in collect(plan["missing"]):
+                if source is None:
+                    missing[code] = missing.get(code, 0) + count
+                    continue
+                sources.append((source, code, count))
+            if sources:
+                # Finish the errand next to the first workshop needed
+                end = self.recipes.recipes[plan["crafts"][0][0]]["skill"] if plan["crafts"] else None
+                route = RoutePlanner(self.spatial, self.seconds_per_tile).plan([source.code for source, _, _ in sources], position, end)
+                pending = list(sources)
+                for stop in route.stops[:len(sources)]:
+                    index = next(index for index, (source, _, _) in enumerate(pending) if source.code == stop.name)
+                    source, code, count = pending.pop(index)
+                    move(stop.pos)
+                    action = "fight" if source.type == "monster" else "gather"
+                    attempts = self._attempts(source, count)
+                    byproducts += max(0.0, attempts * self.sources.expected_drops(source) - count)
+                    add(code, count, inventory)
+                    steps.append(PlanStep(action, position.x, position.y, code, inventory[code], attempts * self.action_seconds[action]))
+
+            for code, crafts in plan["crafts"]:
+                recipe = self.recipes.recipes[code]
+                if any(material in missing for material, _ in recipe["materials"]):
+                    missing[code] = missing.get(code, 0) + crafts * recipe["yield"]
+                    continue
+                move(self._locate(recipe["skill"], position))
+                for material, amount in recipe["materials"]:
+                    add(material, -amount * crafts, inventory)
+                add(code, crafts * recipe["yield"], inventory)
+                steps.append(PlanStep("craft", position.x, position.y, code, crafts, crafts * self.action_seconds["craft"]))
+
+            remaining -= batch
+            if remaining > 0 and (inventory or byproducts):
+                # Empty the inventory (output, surplus and other drops); the next batch withdraws what it needs
+                move(bank_position)
+                steps.append(PlanStep("deposit_all", position.x, position.y, seconds=(len(inventory) + 1) * self.action_seconds["bank"]))
+                for code, count in list(inventory.items()):
+                    add(code, -count, inventory)
+                    add(code, count, bank)
+                byproducts = 0.0
+
+        return ProductionPlan(steps=steps, seconds=sum(step.seconds for step in steps), missing=missing,
+                              unmet_skills=unmet_skills, keep=keep, bank=bank_position)
+
+    @staticmethod
+    def _combined(inventory: Dict[str, int], bank: Dict[str, int]) -> Dict[str, int]:
+        combined = dict(bank)
+        for code, count in inventory.items():
+            combined[code] = combined.get(code, 0) + count
+        return combined
+
+    @staticmethod
+    def _batch_size(remaining: int, free: int, load) -> int:
+        if load(remaining) <= free:
+            return remaining
+        low, high = 0, remaining
+        while high - low > 1:
+            middle = (low + high) // 2
+            if load(middle) <= free:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def _attempts(source: DropSource, count: int) -> float:
+        """Expected gathers or fights for a source to drop count units of an item."""
+        return count * source.rate / ((source.min_quantity + source.max_quantity) / 2)
+
+    def _locate(self, content: str, position: Position) -> Position:
+        nearest = self.spatial.nearest(position, 1, content_code=content) or self.spatial.nearest(position, 1, content_type=content)
+        if not nearest:
+            raise APIException.MapItemNotFound(f"No map tile holds '{content}'")
+        tile = nearest[0][1]
+        return Position(tile['x'], tile['y'])
+
+    def _best_source(self, code: str, count: int, position: Position, skills: Optional[Dict[str, int]], level: Optional[int]) -> Optional[DropSource]:
+        best, best_seconds = None, None
+        for source in self.sources.get(code):
+            if not source.tiles:
+                continue
+            if source.type == "resource" and skills is not None and skills.get(source.skill, 0) < source.level:
+                continue
+            if source.type == "monster" and level is not None and level < source.level:
+                continue
+            action = "fight" if source.type == "monster" else "gather"
+            attempts = self._attempts(source, count)
+            travel = min(position.dist(tile) for tile in source.tiles) * self.seconds_per_tile
+            seconds = attempts * self.action_seconds[action] + travel
+            if best_seconds is None or seconds < best_seconds:
+                best, best_seconds = source, seconds
+        return best
+
+
+class Items:
+    QUERY_FIELDS = {
+        'name': QueryField.key("regex", 'name'),
+        'item_type': QueryField.key("eq", 'type'),
+        'craft_skill': QueryField("eq", lambda item: (item.get('craft') or {}).get('skill')),
+        'craft_material': QueryField("any", lambda item: (item.get('craft') or {}).get('items'), attr='code'),
+        'min_level': QueryField.key("min", 'level', default=0),
+        'max_level': QueryField.key("max", 'level', default=0),
+    }
+
+    def __init__(self, api):
+        self.api = api
+        self.store = StaticDataStore.get_shared()
+
+    @property
+    def cache(self) -> dict:
+        return self.store.index("items")
+
+    @property
+    def all_items(self) -> list:
+        return self.store.records("items")
+
+    @property
+    def index(self) -> ItemIndex:
+        """Secondary indexes over the cached items, rebuilt whenever the catalog is reloaded."""
+        return self.store.derive("items_index", ("items",), lambda: ItemIndex(self.all_items))
+
+    @property
+    def query(self) -> QueryEngine:
+        """Query engine over the cached items, narrowing candidates with the secondary indexes."""
+        return self.store.derive("items_query", ("items",), lambda: self.store.query_engine("items", self.QUERY_FIELDS, index=self.index))
+
+    @property
+    def recipes(self) -> RecipeGraph:
+        """Recipe graph of the cached items, rebuilt whenever the catalog is reloaded."""
+        return self.store.derive("items_recipes", ("items",), lambda: RecipeGraph(self.all_items))
+
+    @property
+    def drop_sources(self) -> DropSourceIndex:
+        """Index of the monsters and resources dropping each item, rebuilt whenever one of its collections is reloaded."""
+        return self.store.derive("drop_sources", ("monsters", "resources", "maps"), lambda: DropSourceIndex(
+            self.store.records("monsters"), self.store.records("resources"), self.store.records("maps")))
+
+    @property
+    def columns(self) -> ItemColumns:
+        """Columnar NumPy view of the cached items, rebuilt whenever the catalog is reloaded. Requires numpy."""
+        return self.store.derive("items_columns", ("items",), lambda: ItemColumns(self.all_items))
+
+    def _cache_items(self):
+        all_items = self.store.load("items", self.api)
+        
+        logger.debug(f"Finished caching {len(all_items)} items", extra={"char": self.api.char.name})
+    
+    def _filter_items(self, params):
+        logger.debug(f"Filtering items with params: {params}", extra={"char": self.api.char.name})
+        
+        filtered_items = self.query.filter(params)
+        
+        logger.debug(f"Filtering complete. Total items after filtering: {len(filtered_items)}", extra={"char": self.api.char.name})
+        return filtered_items
+
+    def get_item(self, params):
+        logger.debug(f"Getting item with params: {params}", extra={"char": self.api.char.name})
+        
+        if not self.all_items:
+            logger.debug("Cache is empty, calling _cache_items() to load items.", extra={"char": self.api.char.name})
+            self._cache_items()
+
+        if "item_code" in params:
+            item = self.cache.get(params["item_code"])
+            if item:
+                logger.debug(f"Found item with code {params['item_code']}", extra={"char": self.api.char.name})
+            else:
+                logger.debug(f"Item with code {params['item_code']} not found in cache", extra={"char": self.api.char.name})
+            return item
+        
+        filtered_items = self._filter_items(params)
+        logger.debug(f"Returning {len(filtered_items)} filtered items", extra={"char": self.api.char.name})
+        return filtered_items
+
+    def get_recipe_tree(self, item_code: str, quantity: int = 1) -> dict:
+        """
+        Expand an item into its full material tree.
+
+        Args:
+            item_code (str): The item to craft.
+            quantity (int): How many units are needed.
+
+        Returns:
+            dict: Nested {"code", "quantity", "crafts", "skill", "level", "materials"} nodes, see RecipeGraph.tree.
+        """
+        if not self.all_items:
+            self._cache_items()
+        return self.recipes.tree(item_code, quantity)
+
+    def get_raw_materials(self, item_code: str, quantity: int = 1) -> Dict[str, int]:
+        """
+        Get the raw materials needed to craft an item from scratch.
+
+        Args:
+            item_code (str): The item to craft.
+            quantity (int): How many units are needed.
+
+        Returns:
+            dict: Raw material code -> quantity.
+        """
+        if not self.all_items:
+            self._cache_items()
+        return self.recipes.raw_materials(item_code, quantity)
+
+    def get_craftable(self, available: Optional[Dict[str, int]] = None, skills: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Find the items that can be crafted from the materials at hand.
+
+        Args:
+            available (dict, optional): Item code -> quantity, e.g. inventory and bank combined.
+                Defaults to the character's inventory.
+            skills (dict, optional): Skill -> level. Defaults to the character's skill levels.
+
+        Returns:
+            dict: Item code -> largest craftable quantity.
+        """
+        if not self.all_items:
+            self._cache_items()
+        char = self.api.char
+        if available is None:
+            available = char.get_inventory_counts()
+        if skills is None:
+            recipes = self.recipes.recipes.values()
+            skills = {recipe["skill"]: getattr(char, f"{recipe['skill']}_level", 0) for recipe in recipes if recipe["skill"]}
+        return self.recipes.craftable(available, skills)
+
+    def get_best_items(self, weights: Dict[str, float], k: int = 10, item_type: Optional[str] = None,
+                       min_level: Optional[int] = None, max_level: Optional[int] = None) -> List[Tuple[dict, float]]:
+        """
+        Rank items by a weighted sum of their effects, vectorized over the whole catalog. Requires numpy.
+
+        Args:
+            weights (dict): Effect code -> weight, e.g. {"attack_earth": 1, "dmg_earth": 0.5}.
+            k (int): Maximum number of items to return.
+            item_type (str, optional): Only rank items of this type, e.g. "weapon".
+            min_level (int, optional): Minimum item level.
+            max_level (int, optional): Maximum item level.
+
+        Returns:
+            List[Tuple[dict, float]]: (item, score) pairs, best first.
+        """
+        if not self.all_items:
+            self._cache_items()
+        columns = self.columns
+        return columns.rank(weights, k, columns.mask(item_type, min_level, max_level))
+
+    def optimize_loadout(self, monster_code: Optional[str] = None, weights: Optional[Dict[str, float]] = None,
+                         bank: Optional[Dict[str, int]] = None, slots: Optional[tuple] = None) -> Loadout:
+        """
+        Find the best equipment for the character among the equipped items, the inventory and the bank.
+
+        Args:
+            monster_code (str, optional): Maximise the expected damage per hit against this monster.
+            weights (dict, optional): Maximise a weighted sum of stats instead, e.g. {"hp": 1, "res_fire": 5}.
+                Weights must not be negative.
+            bank (dict, optional): Item code -> quantity in the bank. Defaults to the account's bank mirror;
+                pass {} to leave the bank out.
+            slots (tuple, optional): Slots to optimize. Defaults to every slot but the utilities.
+
+        Returns:
+            Loadout: The chosen item per slot and the actions to equip them, see Loadout.apply.
+        """
+        if not self.all_items:
+            self._cache_items()
+        if monster_code is not None:
+            self.store.load("monsters", self.api)
+            monster = self.store.index("monsters").get(monster_code)
+            if monster is None:
+                raise APIException.NotFound(f"Monster {monster_code} not found")
+            objective = LoadoutOptimizer.damage_objective(monster)
+        elif weights is not None:
+            objective = LoadoutOptimizer.weighted_objective(weights)
+        else:
+            raise ValueError("Either monster_code or weights is required")
+
+        if bank is None:
+            bank = self.api.get_bank().snapshot()
+
+        char = self.api.char
+        # get_equipment_slots names the armour slots "body" and "legs"; the optimizer uses the API slot names
+        equipped = {slot: getattr(char, f"{slot}_slot", None) or None for slot in LoadoutOptimizer.SLOT_TYPES}
+        inventory = char.get_inventory_counts()
+
+        # Character stats without the effects of the equipped items
+        names = {f"{kind}_{element}" for kind in ("attack", "dmg", "res") for element in ELEMENTS} | {"critical_strike", "haste", "dmg"}
+        names |= {code for item in self.all_items for code in LoadoutOptimizer.effects(item)}
+        base = {}
+        for name in names:
+            value = getattr(char, "max_hp" if name == "hp" else name, 0)
+            base[name] = value if isinstance(value, (int, float)) else 0
+        for code in equipped.values():
+            for name, value in LoadoutOptimizer.effects(self.cache.get(code)).items():
+                base[name] = base.get(name, 0) - value
+
+        loadout = LoadoutOptimizer(self.cache, objective).optimize(
+            base, equipped, inventory, bank, level=char.level, slots=slots or LoadoutOptimizer.DEFAULT_SLOTS)
+        logger.debug(f"Best loadout scores {loadout.score:.2f} with {len(loadout.actions)} actions", extra={"char": char.name})
+        return loadout
+
+    def get_drop_sources(self, item_code: str) -> List[DropSource]:
+        """
+        Find where an item can be obtained from.
+
+        Args:
+            item_code (str): The item to look up.
+
+        Returns:
+            List[DropSource]: The monsters and resources dropping the item with their drop rate, level
+            and map tiles, most reliable first.
+        """
+        for name in ("monsters", "resources", "maps"):
+            self.store.load(name, self.api)
+        return self.drop_sources.get(item_code)
+
+    def plan_production(self, item_code: str, quantity: int = 1, bank: Optional[Dict[str, int]] = None) -> ProductionPlan:
+        """
+        Plan how the character can produce an item, minimising the estimated cooldown.
+
+        Args:
+            item_code (str): The item to produce.
+            quantity (int): How many units to produce.
+            bank (dict, optional): Item code -> quantity in the bank. Defaults to the account's bank mirror;
+                pass {} to leave the bank out.
+
+        Returns:
+            ProductionPlan: The steps to perform, see ProductionPlan.execute.
+        """
+        if not self.all_items:
+            self._cache_items()
+        for name in ("monsters", "resources", "maps"):
+            self.store.load(name, self.api)
+
+        if bank is None:
+            bank = self.api.get_bank().snapshot()
+
+        char = self.api.char
+        inventory = char.get_inventory_counts()
+        skills = {skill: getattr(char, f"{skill}_level", 0) for skill in PRODUCTION_SKILLS}
+        planner = ProductionPlanner(self.recipes, self.drop_sources, self.api.maps.spatial)
+        plan = planner.plan(item_code, quantity, inventory, bank, char.pos, char.get_inventory_space(), skills, char.level)
+        logger.debug(f"Planned {quantity} {item_code} in {len(plan.steps)} steps (~{plan.seconds:.0f}s)", extra={"char": char.name})
+        return plan
+
+class Maps:
+    QUERY_FIELDS = {
+        'map_content': QueryField("regex", lambda map_item: _content_field(map_item, 'code')),
+        'content_type': QueryField("eq", lambda map_item: _content_field(map_item, 'type')),
+    }
+
+    def __init__(self, api: "ArtifactsAPI"):
+        self.api = api
+        self.store = StaticDataStore.get_shared()
+
+    @property
+    def cache(self) -> dict:
+        return self.store.index("maps")
+
+    @property
+    def all_maps(self) -> list:
+        return self.store.records("maps")
+
+    @property
+    def query(self) -> QueryEngine:
+        """Query engine over the cached maps, rebuilt whenever they are reloaded."""
+        return self.store.derive("maps_query", ("maps",), lambda: self.store.query_engine("maps", self.QUERY_FIELDS))
+
+    @property
+    def spatial(self) -> MapSpatialIndex:
+        """Grid index of the cached maps by content, rebuilt whenever they are reloaded."""
+        return self.store.derive("maps_spatial", ("maps",), lambda: MapSpatialIndex(self.all_maps))
+
+    def _cache_maps(self):
+        all_maps = self.store.load("maps", self.api)
+        
+        logger.debug(f"Finished caching {len(all_maps)} maps", extra={"char": self.api.char.name})
+
+    def _filter_maps(self, params):
+        logger.debug(f"Filtering maps with params: {params}", extra={"char": self.api.char.name})
+        
+        filtered_maps = self.query.filter(params)
+
+        logger.debug(f"Filtering complete. Total maps after filtering: {len(filtered_maps)}", extra={"char": self.api.char.name})
+        return filtered_maps
+
+    def get_map(self, params):
+        logger.debug(f"Getting map with params: {params}", extra={"char": self.api.char.name})
+        
+        if not self.all_maps:
+            logger.debug("Cache is empty, calling _cache_maps() to load maps.", extra={"char": self.api.char.name})
+            self._cache_maps()
+
+        if "x" in params and "y" in params:
+            map_key = f"{params['x']}/{params['y']}"
+            map_item = self.cache.get(map_key)
             if map_item:
                 logger.debug(f"Found map at coordinates {map_key}", extra={"char": self.api.char.name})
             else:
@@ -1153,47 +4515,88 @@ class Maps:
         logger.debug(f"Returning {len(filtered_maps)} filtered maps", extra={"char": self.api.char.name})
         return filtered_maps
 
+    def get_nearest(self, content_code: Optional[str] = None, content_type: Optional[str] = None, position=None, k: int = 1) -> List[dict]:
+        """
+        Get the map tiles with the given content closest to a position.
+
+        Args:
+            content_code (str, optional): Content code to look for, e.g. "copper_rocks".
+            content_type (str, optional): Content type to look for, e.g. "bank". Narrows content_code if both are given.
+            position (optional): Position or (x, y) pair to measure from. Defaults to the character's position.
+            k (int): Maximum number of tiles to return.
+
+        Returns:
+            List[dict]: Up to k map tiles, closest first by Manhattan distance.
+        """
+        if not self.all_maps:
+            self._cache_maps()
+        if position is None:
+            position = self.api.char.pos
+
+        nearest = self.spatial.nearest(position, k, content_code=content_code, content_type=content_type)
+        logger.debug(f"Found {len(nearest)} tiles near {tuple(position)} for {content_code or content_type}", extra={"char": self.api.char.name})
+        return [map_item for _, map_item in nearest]
+
+    def plan_route(self, stops: list, start=None, end=None) -> Route:
+        """
+        Order a multi-stop errand to minimise the total move cooldown.
+
+        Args:
+            stops (list): Positions, (x, y) pairs or content codes/types (e.g. "bank", "copper_rocks") to visit in any order.
+            start (optional): Position or (x, y) pair to start from. Defaults to the character's position.
+            end (optional): Stop the route must finish at, e.g. "bank".
+
+        Returns:
+            Route: The stops in visiting order, ready for `for x, y in route: actions.move(x, y)`.
+        """
+        if not self.all_maps:
+            self._cache_maps()
+        if start is None:
+            start = self.api.char.pos
+
+        route = RoutePlanner(self.spatial).plan(stops, start, end)
+        logger.debug(f"Planned route: {route}", extra={"char": self.api.char.name})
+        return route
+
 class Monsters:
+    QUERY_FIELDS = {
+        'name': QueryField.key("regex", 'name'),
+        'drop': QueryField.key("any", 'drops', attr='code'),
+        'min_level': QueryField.key("min", 'level', default=0),
+        'max_level': QueryField.key("max", 'level', default=0),
+    }
+
     def __init__(self, api: "ArtifactsAPI"):
         self.api = api
-        self.cache = {}
-        self.all_monsters = []
+        self.store = StaticDataStore.get_shared()
+
+    @property
+    def cache(self) -> dict:
+        return self.store.index("monsters")
+
+    @property
+    def all_monsters(self) -> list:
+        return self.store.records("monsters")
+
+    @property
+    def query(self) -> QueryEngine:
+        """Query engine over the cached monsters, rebuilt whenever they are reloaded."""
+        return self.store.derive("monsters_query", ("monsters",), lambda: self.store.query_engine("monsters", self.QUERY_FIELDS))
+
+    @property
+    def columns(self) -> MonsterColumns:
+        """Columnar NumPy view of the cached monsters, rebuilt whenever they are reloaded. Requires numpy."""
+        return self.store.derive("monsters_columns", ("monsters",), lambda: MonsterColumns(self.all_monsters))
 
     def _cache_monsters(self):
-        endpoint = "monsters?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_monsters")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        logger.debug(f"Caching {pages} pages of monsters", extra={"char": self.api.char.name})
-        
-        all_monsters = []
-        for i in range(pages):
-            endpoint = f"monsters?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_monsters")
-            monster_list = res["data"]
-            all_monsters.extend(monster_list)
-            logger.debug(f"Fetched {len(monster_list)} monsters from page {i+1}", extra={"char": self.api.char.name})
-        
-        self.cache = {monster['code']: monster for monster in all_monsters}
-        self.all_monsters = all_monsters
+        all_monsters = self.store.load("monsters", self.api)
         
         logger.debug(f"Finished caching {len(all_monsters)} monsters", extra={"char": self.api.char.name})
 
     def _filter_monsters(self, params):
         logger.debug(f"Filtering monsters with params: {params}", extra={"char": self.api.char.name})
         
-        filtered_monsters = self.all_monsters
-        
-        for key, value in params.items():
-            logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-            
-            if key == 'drop':
-                filtered_monsters = [monster for monster in filtered_monsters 
-                                  if any(drop['code'] == value for drop in monster.get('drops', []))]
-            elif key == 'max_level':
-                filtered_monsters = [monster for monster in filtered_monsters if monster['level'] <= value]
-            elif key == 'min_level':
-                filtered_monsters = [monster for monster in filtered_monsters if monster['level'] >= value]
+        filtered_monsters = self.query.filter(params)
 
         logger.debug(f"Filtering complete. Total monsters after filtering: {len(filtered_monsters)}", 
                     extra={"char": self.api.char.name})
@@ -1222,50 +4625,103 @@ class Monsters:
                     extra={"char": self.api.char.name})
         return filtered_monsters
 
+    def get_least_dangerous(self, resistances=None, k: int = 10, min_level: Optional[int] = None,
+                            max_level: Optional[int] = None) -> List[Tuple[dict, float]]:
+        """
+        Rank monsters by the damage their hits deal through the given resistances. Requires numpy.
+
+        Args:
+            resistances (optional): {element: percent} or a sequence ordered like ELEMENTS. Defaults to the character's resistances.
+            k (int): Maximum number of monsters to return.
+            min_level (int, optional): Minimum monster level.
+            max_level (int, optional): Maximum monster level.
+
+        Returns:
+            List[Tuple[dict, float]]: (monster, damage per hit) pairs, least damage first.
+        """
+        if not self.all_monsters:
+            self._cache_monsters()
+        if resistances is None:
+            resistances = {element: getattr(self.api.char, f"res_{element}") for element in ELEMENTS}
+        columns = self.columns
+        return columns.rank(columns.incoming_damage(resistances), k, columns.mask(min_level, max_level), lowest=True)
+
+    def simulate_fights(self, player=None, samples: int = 0, seed: Optional[int] = None) -> List[dict]:
+        """
+        Estimate the outcome of fighting every cached monster. Requires numpy.
+
+        Args:
+            player (optional): PlayerData or dict of stats. Defaults to the character.
+            samples (int): Monte-Carlo fights sampled per monster to account for critical strikes. 0 uses expected damage.
+            seed (int, optional): Seed of the crit sampling.
+
+        Returns:
+            List[dict]: {"monster", "win_rate", "turns", "hp_lost"} per monster, in catalog order.
+        """
+        if not self.all_monsters:
+            self._cache_monsters()
+        simulator = CombatSimulator()
+        outcome = simulator.simulate(simulator.player_stats(player or self.api.char), self.columns, samples, seed)
+        return [
+            {"monster": monster, "win_rate": float(win_rate), "turns": float(turns), "hp_lost": float(hp_lost)}
+            for monster, win_rate, turns, hp_lost in zip(self.all_monsters, outcome.win_rate, outcome.turns, outcome.hp_lost)
+        ]
+
+    def simulate_variants(self, monster_code: str, variants: list, samples: int = 0, seed: Optional[int] = None) -> CombatOutcome:
+        """
+        Estimate the outcome of fighting one monster with each of several stat variants, e.g. gear sets. Requires numpy.
+
+        Args:
+            monster_code (str): The monster to fight.
+            variants (list): PlayerData objects or dicts of stats.
+            samples (int): Monte-Carlo fights sampled per variant. 0 uses expected damage.
+            seed (int, optional): Seed of the crit sampling.
+
+        Returns:
+            CombatOutcome: One entry per variant.
+        """
+        if not self.all_monsters:
+            self._cache_monsters()
+        monster = self.cache.get(monster_code)
+        if monster is None:
+            raise APIException.NotFound(f"Monster {monster_code} not found")
+        simulator = CombatSimulator()
+        return simulator.simulate(simulator.player_stats(variants), MonsterColumns([monster]), samples, seed)
+
 class Resources:
+    QUERY_FIELDS = {
+        'drop': QueryField.key("any", 'drops', attr='code'),
+        'skill': QueryField.key("eq", 'skill'),
+        'min_level': QueryField.key("min", 'level', default=0),
+        'max_level': QueryField.key("max", 'level', default=0),
+    }
+
     def __init__(self, api: "ArtifactsAPI"):
         self.api = api
-        self.cache = {}
-        self.all_resources = []
+        self.store = StaticDataStore.get_shared()
+
+    @property
+    def cache(self) -> dict:
+        return self.store.index("resources")
+
+    @property
+    def all_resources(self) -> list:
+        return self.store.records("resources")
+
+    @property
+    def query(self) -> QueryEngine:
+        """Query engine over the cached resources, rebuilt whenever they are reloaded."""
+        return self.store.derive("resources_query", ("resources",), lambda: self.store.query_engine("resources", self.QUERY_FIELDS))
 
     def _cache_resources(self):
-        endpoint = "resources?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_resources")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        logger.debug(f"Caching {pages} pages of resources", extra={"char": self.api.char.name})
-        
-        all_resources = []
-        for i in range(pages):
-            endpoint = f"resources?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_resources")
-            resource_list = res["data"]
-            all_resources.extend(resource_list)
-            logger.debug(f"Fetched {len(resource_list)} resources from page {i+1}", 
-                        extra={"char": self.api.char.name})
-        
-        self.cache = {resource['code']: resource for resource in all_resources}
-        self.all_resources = all_resources
+        all_resources = self.store.load("resources", self.api)
         
         logger.debug(f"Finished caching {len(all_resources)} resources", extra={"char": self.api.char.name})
 
     def _filter_resources(self, params):
         logger.debug(f"Filtering resources with params: {params}", extra={"char": self.api.char.name})
         
-        filtered_resources = self.all_resources
-        
-        for key, value in params.items():
-            logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-            
-            if key == 'drop':
-                filtered_resources = [resource for resource in filtered_resources 
-                                   if any(drop['code'] == value for drop in resource.get('drops', []))]
-            elif key == 'max_level':
-                filtered_resources = [resource for resource in filtered_resources if resource['level'] <= value]
-            elif key == 'min_level':
-                filtered_resources = [resource for resource in filtered_resources if resource['level'] >= value]
-            elif key == 'skill':
-                filtered_resources = [resource for resource in filtered_resources if resource.get('skill') == value]
+        filtered_resources = self.query.filter(params)
 
         logger.debug(f"Filtering complete. Total resources after filtering: {len(filtered_resources)}", 
                     extra={"char": self.api.char.name})
@@ -1295,86 +4751,61 @@ class Resources:
         return filtered_resources
 
 class Tasks:
+    QUERY_FIELDS = {
+        'name': QueryField.key("regex", 'name'),
+        'skill': QueryField.key("eq", 'skill'),
+        'task_type': QueryField.key("eq", 'type'),
+        'min_level': QueryField.key("min", 'level', default=0),
+        'max_level': QueryField.key("max", 'level', default=0),
+    }
+    REWARD_QUERY_FIELDS = {
+        'name': QueryField.key("regex", 'name'),
+    }
+
     def __init__(self, api: "ArtifactsAPI"):
         self.api = api
-        self.cache = {}
-        self.all_tasks = []
-        self.rewards_cache = {}
-        self.all_rewards = []
+        self.store = StaticDataStore.get_shared()
+
+    @property
+    def cache(self) -> dict:
+        return self.store.index("tasks")
+
+    @property
+    def all_tasks(self) -> list:
+        return self.store.records("tasks")
+
+    @property
+    def query(self) -> QueryEngine:
+        """Query engine over the cached tasks, rebuilt whenever they are reloaded."""
+        return self.store.derive("tasks_query", ("tasks",), lambda: self.store.query_engine("tasks", self.QUERY_FIELDS))
+
+    @property
+    def rewards_cache(self) -> dict:
+        return self.store.index("rewards")
+
+    @property
+    def all_rewards(self) -> list:
+        return self.store.records("rewards")
+
+    @property
+    def rewards_query(self) -> QueryEngine:
+        """Query engine over the cached task rewards, rebuilt whenever they are reloaded."""
+        return self.store.derive("rewards_query", ("rewards",), lambda: self.store.query_engine("rewards", self.REWARD_QUERY_FIELDS))
 
     def _cache_tasks(self):
-        endpoint = "tasks/list?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_tasks")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        logger.debug(f"Caching {pages} pages of tasks", extra={"char": self.api.char.name})
-        
-        all_tasks = []
-        for i in range(pages):
-            endpoint = f"tasks/list?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_tasks")
-            task_list = res["data"]
-            all_tasks.extend(task_list)
-            logger.debug(f"Fetched {len(task_list)} tasks from page {i+1}", extra={"char": self.api.char.name})
-        
-        self.cache = {task['code']: task for task in all_tasks}
-        self.all_tasks = all_tasks
+        all_tasks = self.store.load("tasks", self.api)
         
         logger.debug(f"Finished caching {len(all_tasks)} tasks", extra={"char": self.api.char.name})
 
     def _cache_rewards(self):
-        endpoint = "tasks/rewards?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_task_rewards")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        logger.debug(f"Caching {pages} pages of task rewards", extra={"char": self.api.char.name})
-        
-        all_rewards = []
-        for i in range(pages):
-            endpoint = f"tasks/rewards?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_task_rewards")
-            reward_list = res["data"]
-            all_rewards.extend(reward_list)
-            logger.debug(f"Fetched {len(reward_list)} task rewards from page {i+1}", extra={"char": self.api.char.name})
-        
-        self.rewards_cache = {reward['code']: reward for reward in all_rewards}
-        self.all_rewards = all_rewards
+        all_rewards = self.store.load("rewards", self.api)
         
         logger.debug(f"Finished caching {len(all_rewards)} task rewards", extra={"char": self.api.char.name})
 
     def _filter_tasks(self, params):
         logger.debug(f"Filtering tasks with params: {params}", extra={"char": self.api.char.name})
         
-        filtered_tasks = self.all_tasks
-        
-        or_conditions = {}
-        for key, value in params.items():
-            if key.startswith("~"):
-                key = key[1:]
-                if key not in or_conditions:
-                    or_conditions[key] = []
-                or_conditions[key].append(value)
-                logger.debug(f"OR condition for {key}: {value}", extra={"char": self.api.char.name})
-            else:
-                logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-                
-                if key == 'skill':
-                    filtered_tasks = [task for task in filtered_tasks if task.get('skill') == value]
-                elif key == 'task_type':
-                    filtered_tasks = [task for task in filtered_tasks if task.get('type') == value]
-                elif key == 'max_level':
-                    filtered_tasks = [task for task in filtered_tasks if task['level'] <= value]
-                elif key == 'min_level':
-                    filtered_tasks = [task for task in filtered_tasks if task['level'] >= value]
-                elif key == 'name':
-                    name_pattern = re.compile(value, re.IGNORECASE)
-                    filtered_tasks = [task for task in filtered_tasks if name_pattern.search(task['name'])]
-
-        # Apply OR conditions
-        for key, values in or_conditions.items():
-            filtered_tasks = [task for task in filtered_tasks if any(task.get(key) == v for v in values)]
-            logger.debug(f"Applied OR condition for {key} with values: {values}. Remaining tasks: {len(filtered_tasks)}", 
-                        extra={"char": self.api.char.name})
+        filtered_tasks = self.query.filter(params)
 
         logger.debug(f"Filtering complete. Total tasks after filtering: {len(filtered_tasks)}", 
                     extra={"char": self.api.char.name})
@@ -1383,28 +4814,7 @@ class Tasks:
     def _filter_rewards(self, params):
         logger.debug(f"Filtering task rewards with params: {params}", extra={"char": self.api.char.name})
         
-        filtered_rewards = self.all_rewards
-        
-        or_conditions = {}
-        for key, value in params.items():
-            if key.startswith("~"):
-                key = key[1:]
-                if key not in or_conditions:
-                    or_conditions[key] = []
-                or_conditions[key].append(value)
-                logger.debug(f"OR condition for {key}: {value}", extra={"char": self.api.char.name})
-            else:
-                logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-                
-                if key == 'name':
-                    name_pattern = re.compile(value, re.IGNORECASE)
-                    filtered_rewards = [reward for reward in filtered_rewards if name_pattern.search(reward['name'])]
-
-        # Apply OR conditions
-        for key, values in or_conditions.items():
-            filtered_rewards = [reward for reward in filtered_rewards if any(reward.get(key) == v for v in values)]
-            logger.debug(f"Applied OR condition for {key} with values: {values}. Remaining rewards: {len(filtered_rewards)}", 
-                        extra={"char": self.api.char.name})
+        filtered_rewards = self.rewards_query.filter(params)
 
         logger.debug(f"Filtering complete. Total rewards after filtering: {len(filtered_rewards)}", 
                     extra={"char": self.api.char.name})
@@ -1468,29 +4878,35 @@ class Tasks:
         return filtered_rewards
     
 class Achievements:
+    QUERY_FIELDS = {
+        'name': QueryField.key("regex", 'name'),
+        'description': QueryField.key("regex", 'description'),
+        'achievement_type': QueryField.key("eq", 'type'),
+        'reward_type': QueryField.key("any", 'rewards', attr='type'),
+        'reward_item': QueryField.key("any", 'rewards', attr='code'),
+        'points_min': QueryField.key("min", 'points', default=0),
+        'points_max': QueryField.key("max", 'points', default=0),
+    }
+
     def __init__(self, api: "ArtifactsAPI"):
         self.api = api
-        self.cache = {}
-        self.all_achievements = []
+        self.store = StaticDataStore.get_shared()
+
+    @property
+    def cache(self) -> dict:
+        return self.store.index("achievements")
+
+    @property
+    def all_achievements(self) -> list:
+        return self.store.records("achievements")
+
+    @property
+    def query(self) -> QueryEngine:
+        """Query engine over the cached achievements, rebuilt whenever they are reloaded."""
+        return self.store.derive("achievements_query", ("achievements",), lambda: self.store.query_engine("achievements", self.QUERY_FIELDS))
 
     def _cache_achievements(self):
-        endpoint = "achievements?size=1"
-        res = self.api._make_request("GET", endpoint, source="get_all_achievements")
-        pages = math.ceil(int(res["pages"]) / 100)
-        
-        logger.debug(f"Caching {pages} pages of achievements", extra={"char": self.api.char.name})
-        
-        all_achievements = []
-        for i in range(pages):
-            endpoint = f"achievements?size=100&page={i+1}"
-            res = self.api._make_request("GET", endpoint, source="get_all_achievements")
-            achievement_list = res["data"]
-            all_achievements.extend(achievement_list)
-            logger.debug(f"Fetched {len(achievement_list)} achievements from page {i+1}", 
-                        extra={"char": self.api.char.name})
-        
-        self.cache = {achievement['code']: achievement for achievement in all_achievements}
-        self.all_achievements = all_achievements
+        all_achievements = self.store.load("achievements", self.api)
         
         logger.debug(f"Finished caching {len(all_achievements)} achievements", 
                     extra={"char": self.api.char.name})
@@ -1498,52 +4914,7 @@ class Achievements:
     def _filter_achievements(self, params):
         logger.debug(f"Filtering achievements with params: {params}", extra={"char": self.api.char.name})
         
-        filtered_achievements = self.all_achievements
-        
-        or_conditions = {}
-        for key, value in params.items():
-            if key.startswith("~"):
-                key = key[1:]
-                if key not in or_conditions:
-                    or_conditions[key] = []
-                or_conditions[key].append(value)
-                logger.debug(f"OR condition for {key}: {value}", extra={"char": self.api.char.name})
-            else:
-                logger.debug(f"Applying filter for {key}: {value}", extra={"char": self.api.char.name})
-                
-                if key == 'achievement_type':
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if achievement.get('type') == value]
-                elif key == 'name':
-                    name_pattern = re.compile(value, re.IGNORECASE)
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if name_pattern.search(achievement['name'])]
-                elif key == 'description':
-                    desc_pattern = re.compile(value, re.IGNORECASE)
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if desc_pattern.search(achievement.get('description', ''))]
-                elif key == 'reward_type':
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if any(reward.get('type') == value 
-                                                for reward in achievement.get('rewards', []))]
-                elif key == 'reward_item':
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if any(reward.get('code') == value 
-                                                for reward in achievement.get('rewards', []))]
-                elif key == 'points_min':
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if achievement.get('points', 0) >= value]
-                elif key == 'points_max':
-                    filtered_achievements = [achievement for achievement in filtered_achievements 
-                                          if achievement.get('points', 0) <= value]
-
-        # Apply OR conditions
-        for key, values in or_conditions.items():
-            filtered_achievements = [achievement for achievement in filtered_achievements 
-                                  if any(achievement.get(key) == v for v in values)]
-            logger.debug(f"Applied OR condition for {key} with values: {values}. " + 
-                        f"Remaining achievements: {len(filtered_achievements)}", 
-                        extra={"char": self.api.char.name})
+        filtered_achievements = self.query.filter(params)
 
         logger.debug(f"Filtering complete. Total achievements after filtering: {len(filtered_achievements)}", 
                     extra={"char": self.api.char.name})
@@ -1620,7 +4991,7 @@ class Events:
         """
         query = f"size=100&page={page}"
         endpoint = f"events/active?{query}"
-        return self.api._make_request("GET", endpoint, source="get_active_events").get("data")
+        return self.api._get_data(endpoint, source="get_active_events")
 
     def get_all(self, page: int = 1) -> dict:
         """
@@ -1634,7 +5005,31 @@ class Events:
         """
         query = f"size=100&page={page}"
         endpoint = f"events?{query}"
-        return self.api._make_request("GET", endpoint, source="get_all_events").get("data")
+        return self.api._get_data(endpoint, source="get_all_events")
+
+    def iter_active(self, max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over active events, across all pages.
+
+        Args:
+            max_items (Optional[int]): Stop after this many events.
+
+        Returns:
+            Paginator: An iterator over active events.
+        """
+        return self.api.paginate("events/active", source="get_active_events", max_items=max_items)
+
+    def iter_all(self, max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over all events, across all pages.
+
+        Args:
+            max_items (Optional[int]): Stop after this many events.
+
+        Returns:
+            Paginator: An iterator over events.
+        """
+        return self.api.paginate("events", source="get_all_events", max_items=max_items)
 
 class GE:
     def __init__(self, api: "ArtifactsAPI"):
@@ -1665,7 +5060,7 @@ class GE:
         if seller:
             query += f"&seller={seller}"
         endpoint = f"grandexchange/history/{item_code}?{query}"
-        return self.api._make_request("GET", endpoint, source="get_ge_history").get("data")
+        return self.api._get_data(endpoint, source="get_ge_history")
 
     def get_sell_orders(self, item_code: Optional[str] = None, seller: Optional[str] = None, page: int = 1) -> dict:
         """
@@ -1685,7 +5080,7 @@ class GE:
         if seller:
             query += f"&seller={seller}"
         endpoint = f"grandexchange/orders?{query}"
-        return self.api._make_request("GET", endpoint, source="get_ge_sell_orders").get("data")
+        return self.api._get_data(endpoint, source="get_ge_sell_orders")
 
     def get_sell_order(self, order_id: str) -> dict:
         """
@@ -1698,7 +5093,44 @@ class GE:
             dict: Response data for the specified sell order.
         """
         endpoint = f"grandexchange/orders/{order_id}"
-        return self.api._make_request("GET", endpoint, source="get_ge_sell_order").get("data")
+        return self.api._get_data(endpoint, source="get_ge_sell_order")
+
+    def iter_history(self, item_code: str, buyer: Optional[str] = None, seller: Optional[str] = None,
+                     max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over the transaction history of an item, across all pages.
+
+        Args:
+            item_code (str): Code of the item.
+            buyer (Optional[str]): Filter history by buyer name.
+            seller (Optional[str]): Filter history by seller name.
+            max_items (Optional[int]): Stop after this many transactions.
+
+        Returns:
+            Paginator: An iterator over transactions.
+        """
+        query = f"buyer={buyer}" if buyer else ""
+        query += f"&seller={seller}" if seller else ""
+        endpoint = f"grandexchange/history/{item_code}?{query.strip('&')}"
+        return self.api.paginate(endpoint, source="get_ge_history", max_items=max_items)
+
+    def iter_sell_orders(self, item_code: Optional[str] = None, seller: Optional[str] = None,
+                         max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over sell orders, across all pages.
+
+        Args:
+            item_code (Optional[str]): Filter by item code.
+            seller (Optional[str]): Filter by seller name.
+            max_items (Optional[int]): Stop after this many orders.
+
+        Returns:
+            Paginator: An iterator over sell orders.
+        """
+        query = f"item_code={item_code}" if item_code else ""
+        query += f"&seller={seller}" if seller else ""
+        endpoint = f"grandexchange/orders?{query.strip('&')}"
+        return self.api.paginate(endpoint, source="get_ge_sell_orders", max_items=max_items)
 
 class Leaderboard:
     def __init__(self, api: "ArtifactsAPI"):
@@ -1746,6 +5178,34 @@ class Leaderboard:
         endpoint = f"leaderboard/accounts?{query}"
         return self.api._make_request("GET", endpoint, source="get_accounts_leaderboard")
 
+    def iter_characters_leaderboard(self, sort: Optional[str] = None, max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over the characters leaderboard, across all pages.
+
+        Args:
+            sort (Optional[str]): Sorting criteria (e.g., 'level', 'xp').
+            max_items (Optional[int]): Stop after this many entries.
+
+        Returns:
+            Paginator: An iterator over leaderboard entries.
+        """
+        query = f"sort={sort}" if sort else ""
+        return self.api.paginate(f"leaderboard/characters?{query}", source="get_characters_leaderboard", max_items=max_items)
+
+    def iter_accounts_leaderboard(self, sort: Optional[str] = None, max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over the accounts leaderboard, across all pages.
+
+        Args:
+            sort (Optional[str]): Sorting criteria (e.g., 'points').
+            max_items (Optional[int]): Stop after this many entries.
+
+        Returns:
+            Paginator: An iterator over leaderboard entries.
+        """
+        query = f"sort={sort}" if sort else ""
+        return self.api.paginate(f"leaderboard/accounts?{query}", source="get_accounts_leaderboard", max_items=max_items)
+
 class Accounts:
     def __init__(self, api: "ArtifactsAPI"):
         """
@@ -1776,8 +5236,26 @@ class Accounts:
             query += f"&achievement_type={achievement_type}"
         query += f"&page={page}"
         endpoint = f"/accounts/{account}/achievements?{query}"
-        return self.api._make_request("GET", endpoint, source="get_account_achievements") 
+        return self.api._make_request("GET", endpoint, source="get_account_achievements")
+
+    def iter_account_achievements(self, account: str, completed: Optional[bool] = None,
+                                  achievement_type: Optional[str] = None, max_items: Optional[int] = None) -> Paginator:
+        """
+        Iterate lazily over the achievements of an account, across all pages.
+
+        Args:
+            account (str): Account name.
+            completed (Optional[bool]): Filter by completion status (True for completed, False for not).
+            achievement_type (Optional[str]): Filter achievements by type.
+            max_items (Optional[int]): Stop after this many achievements.
 
+        Returns:
+            Paginator: An iterator over achievements.
+        """
+        query = f"completed={str(completed).lower()}" if completed is not None else ""
+        query += f"&achievement_type={achievement_type}" if achievement_type else ""
+        endpoint = f"accounts/{account}/achievements?{query.strip('&')}"
+        return self.api.paginate(endpoint, source="get_account_achievements", max_items=max_items)
 
     def get_account(self, account: str):
         endpoint = f"/acounts/{account}"
@@ -1785,7 +5263,22 @@ class Accounts:
 
 # --- Wrapper ---
 class ArtifactsAPI:
-    def __init__(self, api_key: str, character_name: str):
+    def __init__(self, api_key: str, character_name: str, session_pool: Optional[HTTPSessionPool] = None,
+                 refetch_missing_state: bool = False, rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None, page_workers: int = 4):
+        """
+        Args:
+            api_key (str): Account token.
+            character_name (str): Name of the character controlled by this instance.
+            session_pool (Optional[HTTPSessionPool]): HTTP transport to use; defaults to the shared pool.
+            refetch_missing_state (bool): Refetch the character after an action whose response carries no
+                character block (default is False). The character is always updated from the character
+                block of the responses that have one.
+            rate_limiter (Optional[RateLimiter]): Limiter consulted before each request; defaults to
+                the limiter shared by every instance using the same token.
+            retry_policy (Optional[RetryPolicy]): Retry behaviour for transient failures; defaults to RetryPolicy().
+            page_workers (int): Pages fetched concurrently when loading a collection (default is 4).
+        """
         extra = {"char": character_name}
         self.logger = logging.LoggerAdapter(logger, extra)
 
@@ -1798,13 +5291,25 @@ class ArtifactsAPI:
             "Accept": "application/json",
             "Authorization": f'Bearer {self.token}'
         }
+        self.session_pool: HTTPSessionPool = session_pool or HTTPSessionPool.get_shared()
+        self.refetch_missing_state: bool = refetch_missing_state
+        self.rate_limiter: RateLimiter = rate_limiter or RateLimiter.for_token(api_key)
+        self.bank: BankMirror = BankMirror.for_token(api_key)
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.single_flight: SingleFlight = SingleFlight.get_shared()
+        self.page_workers: int = page_workers
+        self.refetches_avoided: int = 0
+        # Guards refetches_avoided, which requests on the page_workers threads update concurrently
+        self.counters_lock = Lock()
         
         # Initialize cooldown manager
         self._cooldown_manager = CooldownManager()
         self._cooldown_manager.logger = self.logger
         
         self.character_name = character_name
-        self.char: PlayerData = self.get_character(character_name=character_name)
+        # Serialises refreshes of self.char, which concurrent requests apply in place
+        self.char_lock = Lock()
+        self.char: PlayerData = self._load_character(character_name)
 
         # --- Subclass definition ---
         self.account = Account(self)
@@ -1826,37 +5331,213 @@ class ArtifactsAPI:
 
     @with_cooldown
     def _make_request(self, method: str, endpoint: str, json: Optional[dict] = None, 
-                     source: Optional[str] = None, retries: int = 3) -> dict:
+                     source: Optional[str] = None, retries: Optional[int] = None) -> dict:
         """
         Makes an API request and returns the JSON response.
         Now managed by cooldown decorator.
+
+        Raises:
+            APIException.RetriesExhausted: If the request kept failing with transient errors.
+        """
+        endpoint = endpoint.strip("/")
+        if source != "get_character":
+            self.logger.debug(f"Sending API request to {self.base_url}/{endpoint} with the following json:\n{json}", extra={"char": self.character_name})
+
+        if method == "GET":
+            # Identical reads in flight at the same time share one request
+            res = self.single_flight.do(
+                (self.token, endpoint),
+                lambda: self._send(method, endpoint, json=json, source=source, retries=retries),
+                namespace="requests",
+            )
+        else:
+            res = self._send(method, endpoint, json=json, source=source, retries=retries)
+        if source in BankMirror.ITEM_SOURCES or source in BankMirror.GOLD_SOURCES:
+            self.bank.apply(source, res)
+        elif source == "bank_buy_expansion":
+            self.bank.invalidate()
+        if source != "get_character":
+            self._update_character_state(method, res)
+
+        return res
+
+    def _send(self, method: str, endpoint: str, json: Optional[dict] = None,
+              source: Optional[str] = None, retries: Optional[int] = None) -> dict:
+        """
+        Send a request, retrying transient failures according to the retry policy.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): API endpoint, including the query string.
+            json (Optional[dict]): Request body.
+            source (Optional[str]): Name of the calling method, used for logging.
+            retries (Optional[int]): Overrides the retry policy's max_retries.
+
+        Returns:
+            dict: Decoded JSON response.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        max_retries = self.retry_policy.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(endpoint)
+            retry_after = None
+            try:
+                response = self.session_pool.request(method, url, headers=self.headers, json=json)
+            except self.retry_policy.retryable_exceptions as e:
+                error = f"{type(e).__name__}: {e} Endpoint: {endpoint}"
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                error = self._error_message(response, endpoint, json, source)
+                if not self.retry_policy.is_retryable(response.status_code):
+                    self._raise(response.status_code, error)
+                    return response.json()
+                retry_after = RetryPolicy.parse_retry_after(response.headers.get("Retry-After"))
+
+            time.sleep(self._next_retry(endpoint, attempt, max_retries, error, retry_after))
+            attempt += 1
+
+    def get_bank(self, force: bool = False) -> BankMirror:
+        """
+        Get the account's bank mirror, loading or reconciling it first if it is stale.
+
+        Args:
+            force (bool): Reload the bank even if the mirror is current (default is False).
+
+        Returns:
+            BankMirror: The mirror shared by every instance of the account.
+        """
+        return self.bank.sync(self, force)
+
+    def paginate(self, endpoint: str, source: Optional[str] = None, max_items: Optional[int] = None,
+                 prefetch: bool = True) -> Paginator:
+        """
+        Iterate lazily over every record of a paginated list endpoint.
+
+        Args:
+            endpoint (str): List endpoint, with its filters but without size and page parameters.
+            source (Optional[str]): Name of the calling method, used for logging.
+            max_items (Optional[int]): Stop after yielding this many records.
+            prefetch (bool): Fetch the next page while the current one is consumed (default is True).
+
+        Returns:
+            Paginator: An iterator over the records.
+        """
+        return Paginator(self, endpoint, source=source, max_items=max_items, prefetch=prefetch)
+
+    def _load_collection(self, path: str, source: Optional[str] = None) -> list:
+        """
+        Load every record of a collection endpoint.
+
+        Concurrent loads of the same collection, from any instance, share a single crawl.
+
+        Args:
+            path (str): Collection endpoint, without query string (e.g. "items").
+            source (Optional[str]): Name of the calling method, used for logging.
+
+        Returns:
+            list: All records of the collection, in page order.
+        """
+        return self.single_flight.do(("collection", path), lambda: self._fetch_collection(path, source), namespace="cache")
+
+    def _fetch_collection(self, path: str, source: Optional[str] = None) -> list:
+        """
+        Fetch every page of a collection endpoint, requesting the pages after the first
+        concurrently with at most page_workers threads.
+
+        Args:
+            path (str): Collection endpoint, without query string (e.g. "items").
+            source (Optional[str]): Name of the calling method, used for logging.
+
+        Returns:
+            list: All records of the collection, in page order.
         """
+        first = self._make_request("GET", f"{path}?size=100&page=1", source=source)
+        pages = int(first.get("pages") or 1)
+        logger.debug(f"Caching {pages} pages of {path}", extra={"char": self.char.name})
+
+        def fetch_page(page: int) -> list:
+            res = self._make_request("GET", f"{path}?size=100&page={page}", source=source)
+            logger.debug(f"Fetched {len(res['data'])} {path} from page {page}", extra={"char": self.char.name})
+            return res["data"]
+
+        records = list(first["data"])
+        if pages > 1:
+            # map() yields in submission order, so records keep their page order
+            with ThreadPoolExecutor(max_workers=min(self.page_workers, pages - 1)) as executor:
+                for page_records in executor.map(fetch_page, range(2, pages + 1)):
+                    records.extend(page_records)
+        return records
+
+    def _error_message(self, response, endpoint: str, json: Optional[dict], source: Optional[str]) -> str:
+        """Build the error message of a failed response."""
         try:
-            endpoint = endpoint.strip("/")
-            url = f"{self.base_url}/{endpoint}"
-            if source != "get_character":
-                self.logger.debug(f"Sending API request to {url} with the following json:\n{json}", extra={"char": self.character_name})
-            response = requests.request(method, url, headers=self.headers, json=json)
+            body = response.json()
+        except ValueError:
+            body = None
+        error = body.get('error', {}).get('message', '') if isinstance(body, dict) else ''
+        message = f"An error occurred. Returned code {response.status_code}, {error} Endpoint: {endpoint}"
+        message += f", Body: {json}" if json else ""
+        message += f", Source: {source}" if source else ""
+        return message
+
+    def _next_retry(self, endpoint: str, attempt: int, max_retries: int, error: str,
+                    retry_after: Optional[float]) -> float:
+        """
+        Account for a failed attempt and get the backoff before the next one.
+
+        Raises:
+            APIException.RetriesExhausted: If no retries are left.
+        """
+        logger.error(error, extra={"char": self.character_name})
+        if attempt >= max_retries:
+            self.retry_policy.record(endpoint, "exhausted")
+            raise APIException.RetriesExhausted(f"Giving up after {attempt + 1} attempts. {error}")
 
-            if response.status_code != 200:
-                message = f"An error occurred. Returned code {response.status_code}, {response.json().get('error', {}).get('message', '')} Endpoint: {endpoint}"
-                message += f", Body: {json}" if json else ""
-                message += f", Source: {source}" if source else ""
+        self.retry_policy.record(endpoint, "retries")
+        delay = self.retry_policy.backoff(attempt, retry_after)
+        logger.warning(f"Retrying in {delay:.2f} seconds, {max_retries - attempt} retries left", extra={"char": self.character_name})
+        return delay
 
-                self._raise(response.status_code, message)
+    def _get_data(self, endpoint: str, source: Optional[str] = None):
+        """
+        Send a GET request and return the "data" field of the response.
+
+        Args:
+            endpoint (str): API endpoint, including the query string.
+            source (Optional[str]): Name of the calling method, used for logging.
+        """
+        return self._make_request("GET", endpoint, source=source).get("data")
 
-            if source != "get_character":
-                self.get_character()
-                
-            return response.json()
+    def _update_character_state(self, method: str, res: dict) -> None:
+        """
+        Refresh self.char after a request.
 
-        except Exception as e:
-            logger.error(e, extra={"char": self.character_name})
-            if retries:
-                retries -= 1
-                logger.warning(f"Retrying, {retries} retries left", extra={"char": self.character_name})
-                return self._make_request(method, endpoint, json, source, retries)
+        The character block carried by the response is applied directly. A follow-up GET is only
+        issued, with refetch_missing_state enabled, for actions whose response has no such block.
 
+        Args:
+            method (str): HTTP method of the request.
+            res (dict): Decoded JSON response.
+        """
+        character = self._response_character(res)
+        if character is not None:
+            self.get_character(data=character)
+        elif method != "GET" and self.refetch_missing_state:
+            self.get_character()
+            return
+        # Reads never change the character, so they never need a refetch
+        with self.counters_lock:
+            self.refetches_avoided += 1
+
+    def _response_character(self, res: dict) -> Optional[dict]:
+        """Return the character block of a response if it describes this character."""
+        data = res.get("data") if isinstance(res, dict) else None
+        character = data.get("character") if isinstance(data, dict) else None
+        if isinstance(character, dict) and character.get("name") == self.char.name:
+            return character
+        return None
 
     def _raise(self, code: int, m: str) -> None:
         """
@@ -1927,10 +5608,17 @@ class ArtifactsAPI:
 
 
     # --- Helper Functions ---
+    def _load_character(self, character_name: str) -> PlayerData:
+        """Fetch the character while the wrapper is being instantiated."""
+        return self.get_character(character_name=character_name)
+
     def get_character(self, data: Optional[dict] = None, character_name: Optional[str] = None) -> PlayerData:
         """
         Retrieve or update the character's data and initialize the character attribute.
 
+        The current character is refreshed in place, under char_lock, so references to self.char
+        stay current and no longer describe the character as it was before the refresh.
+
         Args:
             data (Optional[dict]): Pre-loaded character data; if None, data will be fetched.
             character_name (Optional[str]): Name of the character; only used if data is None.
@@ -1945,87 +5633,343 @@ class ArtifactsAPI:
                 endpoint = f"characters/{self.char.name}"
             data = self._make_request("GET", endpoint, source="get_character").get('data')
 
-        inventory_data = data.get("inventory", [])
-        player_inventory: List[InventoryItem] = [
-            InventoryItem(slot=item["slot"], code=item["code"], quantity=item["quantity"]) 
-            for item in inventory_data if item["code"]
-        ]
+        with self.char_lock:
+            if getattr(self, "char", None) is not None and self.char.name == data["name"]:
+                self.char.update(data)
+            else:
+                self.char = PlayerData.from_payload(data)
+            return self.char
+    
+
+# --- Async Wrapper ---
+class AsyncItems(Items):
+    async def _cache_items(self):
+        all_items = await self.store.load_async("items", self.api)
+        logger.debug(f"Finished caching {len(all_items)} items", extra={"char": self.api.char.name})
+
+    async def get_item(self, params):
+        if not self.all_items:
+            await self._cache_items()
+        return Items.get_item(self, params)
+
+    async def get_recipe_tree(self, item_code: str, quantity: int = 1) -> dict:
+        if not self.all_items:
+            await self._cache_items()
+        return Items.get_recipe_tree(self, item_code, quantity)
+
+    async def get_raw_materials(self, item_code: str, quantity: int = 1) -> Dict[str, int]:
+        if not self.all_items:
+            await self._cache_items()
+        return Items.get_raw_materials(self, item_code, quantity)
+
+    async def get_craftable(self, available: Optional[Dict[str, int]] = None, skills: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        if not self.all_items:
+            await self._cache_items()
+        return Items.get_craftable(self, available, skills)
+
+    async def get_best_items(self, weights: Dict[str, float], k: int = 10, item_type: Optional[str] = None,
+                             min_level: Optional[int] = None, max_level: Optional[int] = None) -> List[Tuple[dict, float]]:
+        if not self.all_items:
+            await self._cache_items()
+        return Items.get_best_items(self, weights, k, item_type, min_level, max_level)
+
+    async def optimize_loadout(self, monster_code: Optional[str] = None, weights: Optional[Dict[str, float]] = None,
+                               bank: Optional[Dict[str, int]] = None, slots: Optional[tuple] = None) -> Loadout:
+        if not self.all_items:
+            await self._cache_items()
+        if monster_code is not None:
+            await self.store.load_async("monsters", self.api)
+        if bank is None:
+            bank = (await self.api.get_bank()).snapshot()
+        return Items.optimize_loadout(self, monster_code, weights, bank, slots)
+
+    async def get_drop_sources(self, item_code: str) -> List[DropSource]:
+        for name in ("monsters", "resources", "maps"):
+            await self.store.load_async(name, self.api)
+        return self.drop_sources.get(item_code)
+
+    async def plan_production(self, item_code: str, quantity: int = 1, bank: Optional[Dict[str, int]] = None) -> ProductionPlan:
+        if not self.all_items:
+            await self._cache_items()
+        for name in ("monsters", "resources", "maps"):
+            await self.store.load_async(name, self.api)
+        if bank is None:
+            bank = (await self.api.get_bank()).snapshot()
+        return Items.plan_production(self, item_code, quantity, bank)
+
+class AsyncMaps(Maps):
+    async def _cache_maps(self):
+        all_maps = await self.store.load_async("maps", self.api)
+        logger.debug(f"Finished caching {len(all_maps)} maps", extra={"char": self.api.char.name})
+
+    async def get_map(self, params):
+        if not self.all_maps:
+            await self._cache_maps()
+        return Maps.get_map(self, params)
+
+    async def get_nearest(self, content_code: Optional[str] = None, content_type: Optional[str] = None, position=None, k: int = 1) -> List[dict]:
+        if not self.all_maps:
+            await self._cache_maps()
+        return Maps.get_nearest(self, content_code, content_type, position, k)
+
+    async def plan_route(self, stops: list, start=None, end=None) -> Route:
+        if not self.all_maps:
+            await self._cache_maps()
+        return Maps.plan_route(self, stops, start, end)
+
+class AsyncMonsters(Monsters):
+    async def _cache_monsters(self):
+        all_monsters = await self.store.load_async("monsters", self.api)
+        logger.debug(f"Finished caching {len(all_monsters)} monsters", extra={"char": self.api.char.name})
+
+    async def get_monster(self, params):
+        if not self.all_monsters:
+            await self._cache_monsters()
+        return Monsters.get_monster(self, params)
+
+    async def get_least_dangerous(self, resistances=None, k: int = 10, min_level: Optional[int] = None,
+                                  max_level: Optional[int] = None) -> List[Tuple[dict, float]]:
+        if not self.all_monsters:
+            await self._cache_monsters()
+        return Monsters.get_least_dangerous(self, resistances, k, min_level, max_level)
+
+    async def simulate_fights(self, player=None, samples: int = 0, seed: Optional[int] = None) -> List[dict]:
+        if not self.all_monsters:
+            await self._cache_monsters()
+        return Monsters.simulate_fights(self, player, samples, seed)
+
+    async def simulate_variants(self, monster_code: str, variants: list, samples: int = 0, seed: Optional[int] = None) -> CombatOutcome:
+        if not self.all_monsters:
+            await self._cache_monsters()
+        return Monsters.simulate_variants(self, monster_code, variants, samples, seed)
+
+class AsyncResources(Resources):
+    async def _cache_resources(self):
+        all_resources = await self.store.load_async("resources", self.api)
+        logger.debug(f"Finished caching {len(all_resources)} resources", extra={"char": self.api.char.name})
+
+    async def get_resource(self, params):
+        if not self.all_resources:
+            await self._cache_resources()
+        return Resources.get_resource(self, params)
+
+class AsyncTasks(Tasks):
+    async def _cache_tasks(self):
+        all_tasks = await self.store.load_async("tasks", self.api)
+        logger.debug(f"Finished caching {len(all_tasks)} tasks", extra={"char": self.api.char.name})
+
+    async def _cache_rewards(self):
+        all_rewards = await self.store.load_async("rewards", self.api)
+        logger.debug(f"Finished caching {len(all_rewards)} task rewards", extra={"char": self.api.char.name})
 
-        self.char = PlayerData(
-            name=data["name"],
-            account=data["account"],
-            skin=data["skin"],
-            level=data["level"],
-            xp=data["xp"],
-            max_xp=data["max_xp"],
-            gold=data["gold"],
-            speed=data["speed"],
-            mining_level=data["mining_level"],
-            mining_xp=data["mining_xp"],
-            mining_max_xp=data["mining_max_xp"],
-            woodcutting_level=data["woodcutting_level"],
-            woodcutting_xp=data["woodcutting_xp"],
-            woodcutting_max_xp=data["woodcutting_max_xp"],
-            fishing_level=data["fishing_level"],
-            fishing_xp=data["fishing_xp"],
-            fishing_max_xp=data["fishing_max_xp"],
-            weaponcrafting_level=data["weaponcrafting_level"],
-            weaponcrafting_xp=data["weaponcrafting_xp"],
-            weaponcrafting_max_xp=data["weaponcrafting_max_xp"],
-            gearcrafting_level=data["gearcrafting_level"],
-            gearcrafting_xp=data["gearcrafting_xp"],
-            gearcrafting_max_xp=data["gearcrafting_max_xp"],
-            jewelrycrafting_level=data["jewelrycrafting_level"],
-            jewelrycrafting_xp=data["jewelrycrafting_xp"],
-            jewelrycrafting_max_xp=data["jewelrycrafting_max_xp"],
-            cooking_level=data["cooking_level"],
-            cooking_xp=data["cooking_xp"],
-            cooking_max_xp=data["cooking_max_xp"],
-            alchemy_level=data["alchemy_level"],
-            alchemy_xp=data["alchemy_xp"],
-            alchemy_max_xp=data["alchemy_max_xp"],
-            hp=data["hp"],
-            max_hp=data["max_hp"],
-            haste=data["haste"],
-            critical_strike=data["critical_strike"],
-            stamina=data["stamina"],
-            attack_fire=data["attack_fire"],
-            attack_earth=data["attack_earth"],
-            attack_water=data["attack_water"],
-            attack_air=data["attack_air"],
-            dmg_fire=data["dmg_fire"],
-            dmg_earth=data["dmg_earth"],
-            dmg_water=data["dmg_water"],
-            dmg_air=data["dmg_air"],
-            res_fire=data["res_fire"],
-            res_earth=data["res_earth"],
-            res_water=data["res_water"],
-            res_air=data["res_air"],
-            pos=Position(data["x"], data["y"]),
-            cooldown=data["cooldown"],
-            cooldown_expiration=data["cooldown_expiration"],
-            weapon_slot=data["weapon_slot"],
-            shield_slot=data["shield_slot"],
-            helmet_slot=data["helmet_slot"],
-            body_armor_slot=data["body_armor_slot"],
-            leg_armor_slot=data["leg_armor_slot"],
-            boots_slot=data["boots_slot"],
-            ring1_slot=data["ring1_slot"],
-            ring2_slot=data["ring2_slot"],
-            amulet_slot=data["amulet_slot"],
-            artifact1_slot=data["artifact1_slot"],
-            artifact2_slot=data["artifact2_slot"],
-            artifact3_slot=data["artifact3_slot"],
-            utility1_slot=data["utility1_slot"],
-            utility2_slot=data["utility2_slot"],
-            utility1_slot_quantity=data["utility1_slot_quantity"],
-            utility2_slot_quantity=data["utility2_slot_quantity"],
-            task=data["task"],
-            task_type=data["task_type"],
-            task_progress=data["task_progress"],
-            task_total=data["task_total"],
-            inventory_max_items=data["inventory_max_items"],
-            inventory=player_inventory
-        )
-        return self.char
-    
\ No newline at end of file
+    async def get_task(self, params):
+        if not self.all_tasks:
+            await self._cache_tasks()
+        return Tasks.get_task(self, params)
+
+    async def get_all_rewards(self, params=None):
+        if not self.all_rewards:
+            await self._cache_rewards()
+        return Tasks.get_all_rewards(self, params)
+
+    async def get_reward(self, params):
+        if not self.all_rewards:
+            await self._cache_rewards()
+        return Tasks.get_reward(self, params)
+
+class AsyncAchievements(Achievements):
+    async def _cache_achievements(self):
+        all_achievements = await self.store.load_async("achievements", self.api)
+        logger.debug(f"Finished caching {len(all_achievements)} achievements", extra={"char": self.api.char.name})
+
+    async def get_achievement(self, params):
+        if not self.all_achievements:
+            await self._cache_achievements()
+        return Achievements.get_achievement(self, params)
+
+    async def get_all(self, params=None):
+        if not self.all_achievements:
+            await self._cache_achievements()
+        return Achievements.get_all(self, params)
+
+class AsyncArtifactsAPI(ArtifactsAPI):
+    """
+    The asyncio counterpart of ArtifactsAPI.
+
+    It exposes the same subsystems (actions, items, maps, monsters, resources, tasks, ge, ...),
+    but every method that talks to the API is a coroutine and cooldowns are awaited rather than
+    slept, so one event loop can drive many characters over a shared connection pool.
+
+    Instances must be created with ``await AsyncArtifactsAPI.create(token, character_name)``.
+    """
+    def __init__(self, api_key: str, character_name: str, session_pool: Optional[AsyncSessionPool] = None,
+                 refetch_missing_state: bool = False, rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None, page_workers: int = 4):
+        """
+        Args:
+            api_key (str): Account token.
+            character_name (str): Name of the character controlled by this instance.
+            session_pool (Optional[AsyncSessionPool]): HTTP transport to use; defaults to the shared async pool.
+            refetch_missing_state (bool): See ArtifactsAPI.
+            rate_limiter (Optional[RateLimiter]): See ArtifactsAPI.
+            retry_policy (Optional[RetryPolicy]): See ArtifactsAPI.
+            page_workers (int): See ArtifactsAPI.
+        """
+        super().__init__(api_key, character_name, session_pool=session_pool or AsyncSessionPool.get_shared(),
+                         refetch_missing_state=refetch_missing_state, rate_limiter=rate_limiter,
+                         retry_policy=retry_policy, page_workers=page_workers)
+
+        # --- Async subclass definition ---
+        self.maps = AsyncMaps(self)
+        self.items = AsyncItems(self)
+        self.monsters = AsyncMonsters(self)
+        self.resources = AsyncResources(self)
+        self.tasks = AsyncTasks(self)
+        self.achiecements = AsyncAchievements(self)
+
+    @classmethod
+    async def create(cls, api_key: str, character_name: str, **kwargs) -> "AsyncArtifactsAPI":
+        """
+        Instantiate the wrapper and load the character.
+
+        Args:
+            api_key (str): Account token.
+            character_name (str): Name of the character controlled by this instance.
+            **kwargs: Forwarded to AsyncArtifactsAPI.__init__.
+
+        Returns:
+            AsyncArtifactsAPI: A ready to use wrapper.
+        """
+        api = cls(api_key, character_name, **kwargs)
+        await api.get_character(character_name=character_name)
+        return api
+
+    def _load_character(self, character_name: str) -> Optional[PlayerData]:
+        # The character is loaded by create(), as __init__ cannot await
+        return None
+
+    async def _make_request(self, method: str, endpoint: str, json: Optional[dict] = None,
+                            source: Optional[str] = None, retries: Optional[int] = None) -> dict:
+        """
+        Makes an API request and returns the JSON response, awaiting the cooldown first.
+        """
+        if source != "get_character":
+            if self.char is not None:
+                self._cooldown_manager.set_cooldown_from_expiration(self.char.cooldown_expiration)
+            await self._cooldown_manager.wait_for_cooldown_async(logger=self.logger, char=self.char)
+
+        endpoint = endpoint.strip("/")
+        if source != "get_character":
+            self.logger.debug(f"Sending API request to {self.base_url}/{endpoint} with the following json:\n{json}", extra={"char": self.character_name})
+
+        if method == "GET":
+            res = await self.single_flight.do_async(
+                (self.token, endpoint),
+                lambda: self._send(method, endpoint, json=json, source=source, retries=retries),
+                namespace="requests",
+            )
+        else:
+            res = await self._send(method, endpoint, json=json, source=source, retries=retries)
+        if source in BankMirror.ITEM_SOURCES or source in BankMirror.GOLD_SOURCES:
+            self.bank.apply(source, res)
+        elif source == "bank_buy_expansion":
+            self.bank.invalidate()
+        if source != "get_character":
+            await self._update_character_state(method, res)
+
+        return res
+
+    async def _send(self, method: str, endpoint: str, json: Optional[dict] = None,
+                    source: Optional[str] = None, retries: Optional[int] = None) -> dict:
+        url = f"{self.base_url}/{endpoint}"
+        max_retries = self.retry_policy.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async(endpoint)
+            retry_after = None
+            try:
+                response = await self.session_pool.request(method, url, headers=self.headers, json=json)
+            except self.retry_policy.retryable_exceptions as e:
+                error = f"{type(e).__name__}: {e} Endpoint: {endpoint}"
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                error = self._error_message(response, endpoint, json, source)
+                if not self.retry_policy.is_retryable(response.status_code):
+                    self._raise(response.status_code, error)
+                    return response.json()
+                retry_after = RetryPolicy.parse_retry_after(response.headers.get("Retry-After"))
+
+            await asyncio.sleep(self._next_retry(endpoint, attempt, max_retries, error, retry_after))
+            attempt += 1
+
+    async def _get_data(self, endpoint: str, source: Optional[str] = None):
+        return (await self._make_request("GET", endpoint, source=source)).get("data")
+
+    async def get_bank(self, force: bool = False) -> BankMirror:
+        return await self.bank.sync_async(self, force)
+
+    def paginate(self, endpoint: str, source: Optional[str] = None, max_items: Optional[int] = None,
+                 prefetch: bool = True) -> AsyncPaginator:
+        return AsyncPaginator(self, endpoint, source=source, max_items=max_items, prefetch=prefetch)
+
+    async def _load_collection(self, path: str, source: Optional[str] = None) -> list:
+        return await self.single_flight.do_async(("collection", path), lambda: self._fetch_collection(path, source),
+                                                 namespace="cache")
+
+    async def _fetch_collection(self, path: str, source: Optional[str] = None) -> list:
+        """
+        Fetch every page of a collection endpoint, requesting the remaining pages concurrently
+        with at most page_workers requests in flight.
+
+        Args:
+            path (str): Collection endpoint, without query string (e.g. "items").
+            source (Optional[str]): Name of the calling method, used for logging.
+
+        Returns:
+            list: All records of the collection, in page order.
+        """
+        first = await self._make_request("GET", f"{path}?size=100&page=1", source=source)
+        pages = int(first.get("pages") or 1)
+        logger.debug(f"Caching {pages} pages of {path}", extra={"char": self.char.name})
+
+        semaphore = asyncio.Semaphore(self.page_workers)
+
+        async def fetch_page(page: int) -> dict:
+            async with semaphore:
+                return await self._make_request("GET", f"{path}?size=100&page={page}", source=source)
+
+        rest = await asyncio.gather(*[fetch_page(page) for page in range(2, pages + 1)])
+        records = list(first["data"])
+        for res in rest:
+            records.extend(res["data"])
+        return records
+
+    async def _update_character_state(self, method: str, res: dict) -> None:
+        character = self._response_character(res)
+        if character is not None:
+            await self.get_character(data=character)
+        elif method != "GET" and self.refetch_missing_state:
+            await self.get_character()
+            return
+        with self.counters_lock:
+            self.refetches_avoided += 1
+
+    async def get_character(self, data: Optional[dict] = None, character_name: Optional[str] = None) -> PlayerData:
+        """
+        Retrieve or update the character's data and initialize the character attribute.
+
+        Args:
+            data (Optional[dict]): Pre-loaded character data; if None, data will be fetched.
+            character_name (Optional[str]): Name of the character; only used if data is None.
+
+        Returns:
+            PlayerData: The PlayerData object with the character's information.
+        """
+        if data is None:
+            if character_name:
+                endpoint = f"characters/{character_name}"
+            else:
+                endpoint = f"characters/{self.char.name}"
+            data = (await self._make_request("GET", endpoint, source="get_character")).get('data')
+        return ArtifactsAPI.get_character(self, data=data)